@@ -0,0 +1,181 @@
+"""Dialogue engine of the chatbot"""
+import asyncio
+import itertools
+import json
+import os
+import sys
+
+import number_tricks
+
+DIALOGUE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dialogue.json")
+INPUTS = ("text", "remainders", "count", "choice")
+HOST = "127.0.0.1"
+PORT = 8890
+BACKLOG = 4096
+
+
+def normalize(answer):
+    """Makes answers comparable: no case, no extra spaces.
+    Returns: str."""
+    return " ".join(answer.lower().split())
+
+
+class State:
+    """One compiled state of the dialogue: the messages to say when the dialogue comes to it,
+    what kind of input it waits for and where the dialogue goes next."""
+    def __init__(self, name, config):
+        """Compiles a state from its config.
+        name: the name of the state.
+        config: dictionary with "say" (list of messages, {variables} are filled in), "input"
+        (one of INPUTS, or none for the last state), "save" (the variable for the input), "next"
+        (the next state), "moduli" (for remainders), "answers" (answers and their next states)
+        and "retry" (the message for a wrong answer) for choice."""
+        self.name = name
+        self.say = config.get("say", [])
+        self.input = config.get("input")
+        if self.input is not None and self.input not in INPUTS:
+            raise ValueError(f"State {name!r} has an unknown input {self.input!r}.")
+        self.save = config.get("save")
+        self.next = config.get("next")
+        self.moduli = config.get("moduli", [])
+        self.answers = {normalize(answer): state for answer, state in config.get("answers", {}).items()}
+        self.retry = config.get("retry", "Please, try again.")
+
+
+class Conversation:
+    """One conversation: its current state, the variables it saved and the numbers it collects."""
+    def __init__(self, variables):
+        """Initialization of the conversation with the variables of the dialogue."""
+        self.state = None
+        self.variables = dict(variables)
+        self.numbers = []
+        self.finished = False
+
+
+class Dialogue:
+    """This class is the compiled dialogue: a table of states with their transitions,
+    and the conversations that go through it. A reply is a lookup in the table, so one process
+    can keep any number of conversations; they are kept by their ids."""
+    def __init__(self, config):
+        """Compiles the dialogue from its config: {"start": the first state, "variables": {...},
+        "states": {name: state config}}. Checks that every transition goes to a known state."""
+        self.states = {name: State(name, state) for name, state in config["states"].items()}
+        self.start = config["start"]
+        self.variables = config.get("variables", {})
+        self.conversations = {}
+        if self.start not in self.states:
+            raise ValueError(f"Unknown start state {self.start!r}.")
+        for state in self.states.values():
+            if state.input in ("text", "remainders", "count") and state.next is None:
+                raise ValueError(f"State {state.name!r} has no next state.")
+            for target in list(state.answers.values()) + ([state.next] if state.next else []):
+                if target not in self.states:
+                    raise ValueError(f"State {state.name!r} goes to an unknown state {target!r}.")
+
+    def _enter(self, conversation, name):
+        """Moves the conversation to a state and says its messages. A state without input
+        goes on to its next state or finishes the conversation.
+        Returns: list of str."""
+        messages = []
+        while True:
+            state = self.states[name]
+            conversation.state = state
+            conversation.numbers = []
+            messages.extend(message.format_map(conversation.variables) + "\n" for message in state.say)
+            if state.input is not None:
+                return messages
+            if state.next is None:
+                conversation.finished = True
+                return messages
+            name = state.next
+
+    def begin(self, conversation_id):
+        """Starts a conversation.
+        Returns: list of str, the messages of the bot."""
+        conversation = Conversation(self.variables)
+        self.conversations[conversation_id] = conversation
+        return self._enter(conversation, self.start)
+
+    def reply(self, conversation_id, text):
+        """Takes a message of the user in a conversation.
+        Returns: iterable of str, the messages of the bot (the counting comes in chunks)."""
+        conversation = self.conversations[conversation_id]
+        state = conversation.state
+        if state.input == "text":
+            conversation.variables[state.save] = text.strip()
+            messages = self._enter(conversation, state.next)
+        elif state.input == "choice":
+            target = state.answers.get(normalize(text))
+            if target is None:
+                return [state.retry + "\n"]
+            messages = self._enter(conversation, target)
+        else:
+            try:
+                number = int(text)
+            except ValueError:
+                return ["Please, enter a number.\n"]
+            if state.input == "remainders":
+                conversation.numbers.append(number)
+                if len(conversation.numbers) < len(state.moduli):
+                    return []
+                conversation.variables[state.save], _ = number_tricks.solve_remainders(conversation.numbers, state.moduli)
+                messages = self._enter(conversation, state.next)
+            else:
+                messages = itertools.chain(number_tricks.count_chunks(number), self._enter(conversation, state.next))
+        if conversation.finished:
+            del self.conversations[conversation_id]
+        return messages
+
+
+def load_dialogue(file_name=DIALOGUE_FILE):
+    """Reads the dialogue config from a JSON file and compiles it.
+    Returns: Dialogue."""
+    with open(file_name, "r") as file:
+        return Dialogue(json.load(file))
+
+
+def run_console(dialogue):
+    """Talks with the user in the console until the conversation is finished."""
+    for message in dialogue.begin(0):
+        sys.stdout.write(message)
+    while 0 in dialogue.conversations:
+        for message in dialogue.reply(0, input()):
+            sys.stdout.write(message)
+
+
+async def serve(dialogue, host=HOST, port=PORT):
+    """Runs the bot over plain TCP, one line per message, with every conversation as an asyncio task,
+    until it's interrupted."""
+    ids = itertools.count()
+
+    async def talk(reader, writer):
+        conversation_id = next(ids)
+        try:
+            messages = dialogue.begin(conversation_id)
+            while True:
+                for message in messages:
+                    writer.write(message.encode())
+                    await writer.drain()
+                if conversation_id not in dialogue.conversations:
+                    break
+                line = await reader.readline()
+                if not line:
+                    break
+                messages = dialogue.reply(conversation_id, line.decode(errors="replace"))
+        except ConnectionError:
+            pass
+        finally:
+            dialogue.conversations.pop(conversation_id, None)
+            writer.close()
+
+    server = await asyncio.start_server(talk, host, port, backlog=BACKLOG)
+    print(f"Serving the chatbot on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(load_dialogue(), port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT))
+    except KeyboardInterrupt:
+        print("Bye!")
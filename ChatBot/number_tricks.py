@@ -0,0 +1,40 @@
+"""Number tricks of the chatbot"""
+
+AGE_MODULI = (3, 5, 7)
+COUNT_CHUNK = 100000
+
+
+def extended_gcd(a, b):
+    """Extended Euclidean algorithm.
+    Returns: tuple (g, x, y) with g = gcd(a, b) = a * x + b * y."""
+    x, last_x, y, last_y = 0, 1, 1, 0
+    while b:
+        quotient, remainder = divmod(a, b)
+        a, b = b, remainder
+        last_x, x = x, last_x - quotient * x
+        last_y, y = y, last_y - quotient * y
+    return a, last_x, last_y
+
+
+def solve_remainders(remainders, moduli=AGE_MODULI):
+    """Chinese Remainder Theorem: finds the number with the given remainders of dividing by pairwise coprime moduli.
+    Returns: tuple (the smallest such number that is not negative, the product of the moduli),
+    every answer is the number plus a multiple of the product."""
+    if len(remainders) != len(moduli):
+        raise ValueError("There should be one remainder for every modulus.")
+    number, product = 0, 1
+    for remainder, modulus in zip(remainders, moduli):
+        g, inverse, _ = extended_gcd(product, modulus)
+        if g != 1:
+            raise ValueError(f"The moduli should be coprime, {modulus} is not.")
+        # number + product * k has the remainder of the modulus when k = (remainder - number) / product.
+        number += product * ((remainder - number) * inverse % modulus)
+        product *= modulus
+    return number % product, product
+
+
+def count_chunks(number, chunk=COUNT_CHUNK):
+    """Formats "0 !", "1 !", ... up to the number, one per line, chunk numbers at a time.
+    Returns: generator of str."""
+    for start in range(0, number + 1, chunk):
+        yield " !\n".join(map(str, range(start, min(start + chunk, number + 1)))) + " !\n"
@@ -0,0 +1,125 @@
+"""Adaptive difficulty for arithmetic_test"""
+
+import json
+import math
+import os
+
+import task_bank
+
+SKILLS_FILE = "skills.json"
+ANSWERS_LOG = "answers.log"
+TARGET_SUCCESS = 0.75
+USER_SPEED = 0.4
+TASK_SPEED = 0.05
+
+# Task families: key -> (function that lists the tasks, starting difficulty).
+# Difficulty and skill are on the same logistic scale: a user whose skill equals the difficulty
+# of a family answers its tasks right half of the time.
+FAMILIES = {
+    "+ 2-9": (lambda: task_bank.simple_tasks(2, 9, '+'), -2.0),
+    "- 2-9": (lambda: task_bank.simple_tasks(2, 9, '-'), -1.5),
+    "* 2-9": (lambda: task_bank.simple_tasks(2, 9, '*'), -1.0),
+    "+ 10-99": (lambda: task_bank.simple_tasks(10, 99, '+'), 0.0),
+    "- 10-99": (lambda: task_bank.simple_tasks(10, 99, '-'), 0.5),
+    "^2 11-29": (lambda: task_bank.square_tasks(11, 29), 1.0),
+    "* 10-99": (lambda: task_bank.simple_tasks(10, 99, '*'), 2.5),
+}
+
+
+def success_chance(skill, difficulty):
+    """
+    :param skill: float, the user's skill.
+    :param difficulty: float, the difficulty of a task family.
+    :return: float, the chance of a right answer.
+    """
+    return 1 / (1 + math.exp(difficulty - skill))
+
+
+class AdaptiveEngine:
+    """
+    Elo-style estimates of user skills and task family difficulties. Every answer moves both estimates
+    by the difference between the result and the expected chance of success, so an update is O(1),
+    and the next task is taken from the family whose expected success is the closest to the target.
+    """
+    def __init__(self, target=TARGET_SUCCESS):
+        """
+        :param target: float, the wanted share of right answers.
+        """
+        self.target = target
+        self.skills = {}
+        self.difficulties = {family: difficulty for family, (_, difficulty) in FAMILIES.items()}
+        self._banks = {}
+
+    def choose_family(self, name):
+        """
+        :param name: str (user's name)
+        :return: str, the key of the family with the expected success closest to the target.
+        """
+        skill = self.skills.get(name, 0.0)
+        return min(FAMILIES,
+                   key=lambda family: abs(success_chance(skill, self.difficulties[family]) - self.target))
+
+    def next_task(self, name):
+        """
+        Picks a task for the user.
+
+        :param name: str (user's name)
+        :return: tuple with the family key, a str for the question and int for the answer.
+        """
+        family = self.choose_family(name)
+        if family not in self._banks:
+            self._banks[family] = task_bank.TaskBank(FAMILIES[family][0]())
+        question, answer = self._banks[family].sample()
+        return family, question, answer
+
+    def update(self, name, family, correct):
+        """
+        Updates the skill of the user and the difficulty of the family after an answer.
+
+        :param name: str (user's name)
+        :param family: str, the key of the task family.
+        :param correct: int, 1 for a right answer, 0 for a wrong one.
+        """
+        skill = self.skills.get(name, 0.0)
+        difficulty = self.difficulties.get(family, 0.0)
+        surprise = correct - success_chance(skill, difficulty)
+        self.skills[name] = skill + USER_SPEED * surprise
+        self.difficulties[family] = difficulty - TASK_SPEED * surprise
+
+    def replay(self, file_name=ANSWERS_LOG, passes=1):
+        """
+        Fits the estimates to a log of old answers, one "name,family,correct" line per answer.
+        Several passes over the log bring the difficulties closer to the data.
+
+        :param file_name: str, file name
+        :param passes: int, how many times to go through the log.
+        :return: int, the number of answers in the log.
+        """
+        answers = 0
+        for _ in range(passes):
+            answers = 0
+            with open(file_name, "r") as file:
+                for line in file:
+                    name, family, correct = line.rstrip("\n").rsplit(",", 2)
+                    self.update(name, family, int(correct))
+                    answers += 1
+        return answers
+
+    def save(self, file_name=SKILLS_FILE):
+        """
+        :param file_name: str, where to save the skills and difficulties.
+        """
+        with open(file_name, "w") as file:
+            json.dump({"skills": self.skills, "difficulties": self.difficulties}, file)
+
+    def load(self, file_name=SKILLS_FILE):
+        """
+        Loads the skills and difficulties saved before, if there are any.
+
+        :param file_name: str, file name
+        """
+        if os.path.exists(file_name):
+            with open(file_name, "r") as file:
+                saved = json.load(file)
+            self.skills.update(saved["skills"])
+            self.difficulties.update(saved["difficulties"])
@@ -1,33 +1,45 @@
 
 """project arithmetic_test"""
 
-import random
+import os
+
+import adaptive
+import results_store
+import task_bank
+
+QUESTIONS = 5
+ADAPTIVE_LEVEL = 0
 
 
 def generate_simple_task():
     """
     Generates a simple arithmetic task with two random numbers and a random operation.
+    The task is picked from the precomputed bank of level 1.
 
     :return: tuple with a str for the question and int for the answer.
     """
-    num1 = random.randint(2, 9)
-    num2 = random.randint(2, 9)
-    operation = random.choice(['+', '-', '*'])
-    question = f"{num1} {operation} {num2}"
-    answer = eval(question)
-    return question, answer
+    return task_bank.get_bank(1).sample()
 
 
 def generate_square_task():
     """
     Generates an integral square task for a random number from 11 to 29.
+    The task is picked from the precomputed bank of level 2.
 
     :return: tuple with a str for the question and int for the answer.
     """
-    num = random.randint(11, 29)
-    question = f"{num}"
-    answer = num ** 2
-    return question, answer
+    return task_bank.get_bank(2).sample()
+
+
+def parse_answer(user_input):
+    """
+    Checks the format of an answer.
+    :param user_input: str, what the user typed.
+    :return: int, or None if it isn't a number.
+    """
+    if user_input.lstrip('-').isdigit():
+        return int(user_input)
+    return None
 
 
 def get_user_answer():
@@ -36,13 +48,23 @@ def get_user_answer():
     :return: inputted int
     """
     while True:
-        user_input = input("Your answer: ")
-        if user_input.lstrip('-').isdigit():
-            return int(user_input)
+        user_answer = parse_answer(input("Your answer: "))
+        if user_answer is not None:
+            return user_answer
         else:
             print("Incorrect format. Please enter a number.")
 
 
+def check_answer(user_answer, correct_answer):
+    """
+    Scores an answer.
+    :param user_answer: int, the user's answer.
+    :param correct_answer: int, correct answer.
+    :return: 1 if the asnwer is correct, 0 if it isn't.
+    """
+    return 1 if user_answer == correct_answer else 0
+
+
 def ask_question(question, correct_answer):
     """
     Shows the question, asks for an answer, then checks it.
@@ -51,49 +73,66 @@ def ask_question(question, correct_answer):
     :return: 1 if the asnwer is correct, 0 if it isn't.
     """
     print(question)
-    user_answer = get_user_answer()
-    if user_answer == correct_answer:
-        print("Right!")
-        return 1
-    else:
-        print("Wrong!")
-        return 0
+    point = check_answer(get_user_answer(), correct_answer)
+    print("Right!" if point else "Wrong!")
+    return point
 
 
 def arithmetic_test(level):
     """
     Test consists of 5 questions according to te level.
 
-    :param level: int (1 or 2)
+    :param level: int (a level from task_bank.LEVELS, 1 or 2 by default)
     :return: int (the number of correct answers)
     """
     score = 0
-    for _ in range(5):
-        if level == 1:
-            question, answer = generate_simple_task()
-        elif level == 2:
-            question, answer = generate_square_task()
+    bank = task_bank.get_bank(level)
+    for _ in range(QUESTIONS):
+        question, answer = bank.sample()
         score += ask_question(question, answer)
-    print(f"Your mark is {score}/5.")
+    print(f"Your mark is {score}/{QUESTIONS}.")
+    return score
+
+
+def adaptive_test(name):
+    """
+    Adaptive test: the operation and the numbers of every next question follow the user's skill,
+    so about 3 of 4 answers are right. The skill is remembered between tests, and every answer
+    is written to the answers log.
+
+    :param name: str (user's name)
+    :return: int (the number of correct answers)
+    """
+    engine = adaptive.AdaptiveEngine()
+    engine.load()
+    score = 0
+    with open(adaptive.ANSWERS_LOG, "a") as log:
+        for _ in range(QUESTIONS):
+            family, question, answer = engine.next_task(name)
+            point = ask_question(question, answer)
+            engine.update(name, family, point)
+            log.write(f"{name},{family},{point}\n")
+            score += point
+    engine.save()
+    print(f"Your mark is {score}/{QUESTIONS}.")
     return score
 
 
 def save_result(name, score, level):
     """
-    Saves the result to the "results.txt"
+    Saves the result to the results database. The results saved to the old "results.txt"
+    are imported into it the first time.
 
     :param name: str (user's name)
     :param score: int (the number of correct answers)
     :param level: int (level)
 
     """
-    level_description = {
-        1: "simple operations with numbers 2-9",
-        2: "integral squares of 11-29"
-    }
-    with open("results.txt", "a") as file:
-        file.write(f"{name}: {score}/5 in level {level} ({level_description[level]}).\n")
-    print('The results are saved in "results.txt".')
+    with results_store.ResultsStore(results_store.RESULTS_DB) as store:
+        if store.is_empty() and os.path.exists("results.txt"):
+            store.import_text("results.txt")
+        store.add(name, score, level, QUESTIONS)
+    print(f'The results are saved in "{results_store.RESULTS_DB}".')
 
 
 def main():
@@ -101,23 +140,30 @@ def main():
     The main function of the program.
     :return:
     """
+    levels = "".join(f"{level} - {task_bank.describe(level)}\n" for level in task_bank.LEVELS)
+    levels += f"{ADAPTIVE_LEVEL} - adaptive: the questions follow your skill\n"
     while True:
         try:
-            level = int(input(
-                "Which level do you want? Enter a number:\n1 - simple operations with numbers 2-9\n2 - integral squares of 11-29\n> "))
-            if level in [1, 2]:
+            level = int(input(f"Which level do you want? Enter a number:\n{levels}> "))
+            if level in task_bank.LEVELS or level == ADAPTIVE_LEVEL:
                 break
             else:
                 print("Incorrect format.")
         except ValueError:
             print("Incorrect format.")
 
-    score = arithmetic_test(level)
+    name = None
+    if level == ADAPTIVE_LEVEL:
+        name = input("What is your name?\n> ").strip()
+        score = adaptive_test(name)
+    else:
+        score = arithmetic_test(level)
 
     while True:
         save = input("Would you like to save your result to the file? Enter yes or no.\n> ").strip().lower()
         if save in ["yes", "y"]:
-            name = input("What is your name?\n> ").strip()
+            if name is None:
+                name = input("What is your name?\n> ").strip()
             save_result(name, score, level)
             break
         elif save in ["no", "n"]:
@@ -0,0 +1,141 @@
+"""Quiz server for arithmetic_test"""
+
+import asyncio
+import sys
+import time
+
+import results_store
+import task_bank
+from arithmetic_test import QUESTIONS, check_answer, parse_answer
+
+HOST = "127.0.0.1"
+PORT = 8888
+FLUSH_SECONDS = 1.0
+BACKLOG = 4096
+
+
+class QuizServer:
+    """
+    Serves arithmetic tests over plain TCP, one line per message, with every session as an asyncio task,
+    so one process can test thousands of students at once. Results, with the time of every answer,
+    are put into a queue and written to the results store in batches by a single writer task.
+    """
+    def __init__(self, store):
+        """
+        :param store: ResultsStore, where to save the results.
+        """
+        self.store = store
+        self.results = asyncio.Queue()
+        self.sessions = 0
+        self.answers = 0
+        self.answer_seconds = 0.0
+
+    async def handle_session(self, reader, writer):
+        """
+        One test: asks the name and the level, then the questions, measuring how long every answer takes.
+        The times are saved with the result, one per question.
+
+        :param reader: asyncio.StreamReader
+        :param writer: asyncio.StreamWriter
+        """
+        async def ask(prompt):
+            writer.write(prompt.encode())
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("The client has left.")
+            return line.decode(errors="replace").strip()
+
+        self.sessions += 1
+        try:
+            name = await ask("What is your name?\n> ")
+            levels = "".join(f"{level} - {task_bank.describe(level)}\n" for level in task_bank.LEVELS)
+            while True:
+                level = await ask(f"Which level do you want? Enter a number:\n{levels}> ")
+                if level.isdigit() and int(level) in task_bank.LEVELS:
+                    level = int(level)
+                    break
+                writer.write(b"Incorrect format.\n")
+
+            score = 0
+            answers = []
+            for question, answer in task_bank.get_bank(level).sample_many(QUESTIONS):
+                start = time.perf_counter()
+                prompt = f"{question}\nYour answer: "
+                while True:
+                    user_answer = parse_answer(await ask(prompt))
+                    if user_answer is not None:
+                        break
+                    prompt = "Incorrect format. Please enter a number.\nYour answer: "
+                seconds = time.perf_counter() - start
+                self.answers += 1
+                self.answer_seconds += seconds
+                point = check_answer(user_answer, answer)
+                score += point
+                answers.append((question, point, seconds))
+                writer.write(b"Right!\n" if point else b"Wrong!\n")
+
+            writer.write(f"Your mark is {score}/{QUESTIONS}.\n".encode())
+            await writer.drain()
+            await self.results.put((name, score, level, answers))
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    def save_result(self, result):
+        """
+        Adds a result from the queue to the store.
+
+        :param result: tuple (name, score, level, list of (question, point, seconds)).
+        """
+        name, score, level, answers = result
+        self.store.add(name, score, level, QUESTIONS, answers=answers)
+
+    async def write_results(self):
+        """
+        The writer task: collects the results that came in and saves them in one batch about once a second.
+        """
+        while True:
+            self.save_result(await self.results.get())
+            await asyncio.sleep(FLUSH_SECONDS)
+            while not self.results.empty():
+                self.save_result(self.results.get_nowait())
+            self.store.flush()
+
+    def average_answer_seconds(self):
+        """
+        :return: float, how long an answer takes on average (0 if there were no answers).
+        """
+        return self.answer_seconds / self.answers if self.answers else 0.0
+
+
+async def serve(host=HOST, port=PORT, file_name=results_store.RESULTS_DB):
+    """
+    Runs the server until it's interrupted.
+
+    :param host: str, the address to listen on.
+    :param port: int, the port to listen on.
+    :param file_name: str, the results database.
+    """
+    with results_store.ResultsStore(file_name) as store:
+        quiz = QuizServer(store)
+        writer_task = asyncio.create_task(quiz.write_results())
+        server = await asyncio.start_server(quiz.handle_session, host, port, backlog=BACKLOG)
+        print(f"Serving arithmetic tests on {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer_task.cancel()
+            while not quiz.results.empty():
+                quiz.save_result(quiz.results.get_nowait())
+            print(f"{quiz.answers} answers, {quiz.average_answer_seconds():.3f} s per answer on average")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT))
+    except KeyboardInterrupt:
+        print("Bye!")
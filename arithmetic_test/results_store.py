@@ -0,0 +1,199 @@
+"""Results store for arithmetic_test"""
+
+import re
+import sqlite3
+import sys
+import time
+
+RESULTS_DB = "results.db"
+RESULT_LINE = re.compile(r"^(?P<name>.*): (?P<score>\d+)/(?P<total>\d+) in level (?P<level>\d+) \(")
+
+
+class ResultsStore:
+    """
+    Results of the tests in an sqlite database. The table is indexed by level and score and by user name,
+    so the best scores of a level and the history of a user are found without reading every result.
+    The answers of a test can be saved with its result, with how long every answer took,
+    in a table indexed by level and question.
+    New results are kept in memory and written in batches.
+    """
+    def __init__(self, file_name=RESULTS_DB, batch_size=100):
+        """
+        :param file_name: str, the database file (":memory:" for a temporary one).
+        :param batch_size: int, how many results to keep before writing them.
+        """
+        self.connection = sqlite3.connect(file_name)
+        self.batch_size = batch_size
+        self.pending = []
+        self.pending_answers = []
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                level INTEGER NOT NULL,
+                created REAL
+            );
+            CREATE INDEX IF NOT EXISTS results_by_level ON results (level, score DESC, id);
+            CREATE INDEX IF NOT EXISTS results_by_name ON results (name, id);
+            CREATE TABLE IF NOT EXISTS answers (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                level INTEGER NOT NULL,
+                question TEXT NOT NULL,
+                correct INTEGER NOT NULL,
+                seconds REAL NOT NULL,
+                created REAL
+            );
+            CREATE INDEX IF NOT EXISTS answers_by_question ON answers (level, question);
+        """)
+
+    def __enter__(self):
+        """
+        :return: ResultsStore, the store itself for a with block.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the store at the end of the with block, the pending results are written first.
+        """
+        self.close()
+
+    def add(self, name, score, level, total=5, created=None, answers=()):
+        """
+        Adds a result, it's written with the next batch.
+
+        :param name: str (user's name)
+        :param score: int (the number of correct answers)
+        :param level: int (level)
+        :param total: int (the number of questions)
+        :param created: float, time of the test (now by default)
+        :param answers: list of tuples (str question, int 1 or 0 for a right or wrong answer, float seconds)
+        """
+        created = time.time() if created is None else created
+        self.pending.append((name, score, total, level, created))
+        self.pending_answers.extend((name, level, question, correct, seconds, created)
+                                    for question, correct, seconds in answers)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes all the pending results in one transaction.
+        """
+        if self.pending:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO results (name, score, total, level, created) VALUES (?, ?, ?, ?, ?)", self.pending)
+                self.connection.executemany(
+                    "INSERT INTO answers (name, level, question, correct, seconds, created) VALUES (?, ?, ?, ?, ?, ?)",
+                    self.pending_answers)
+            self.pending = []
+            self.pending_answers = []
+
+    def close(self):
+        """
+        Writes the pending results and closes the database.
+        """
+        self.flush()
+        self.connection.close()
+
+    def is_empty(self):
+        """
+        :return: bool, True if there are no results at all.
+        """
+        self.flush()
+        return self.connection.execute("SELECT 1 FROM results LIMIT 1").fetchone() is None
+
+    def top_scores(self, level, count=10):
+        """
+        Finds the best results of a level.
+
+        :param level: int (level)
+        :param count: int, how many results to return.
+        :return: list of tuples (name, score, total), the best first.
+        """
+        self.flush()
+        return self.connection.execute(
+            "SELECT name, score, total FROM results WHERE level = ? ORDER BY score DESC, id LIMIT ?",
+            (level, count)).fetchall()
+
+    def history(self, name):
+        """
+        Finds every result of a user.
+
+        :param name: str (user's name)
+        :return: list of tuples (score, total, level, created), the oldest first.
+        """
+        self.flush()
+        return self.connection.execute(
+            "SELECT score, total, level, created FROM results WHERE name = ? ORDER BY id", (name,)).fetchall()
+
+    def answer_times(self, level, count=10):
+        """
+        Finds the questions of a level that take the longest to answer.
+
+        :param level: int (level)
+        :param count: int, how many questions to return.
+        :return: list of tuples (question, number of answers, share of right answers, average seconds),
+        the slowest first.
+        """
+        self.flush()
+        return self.connection.execute(
+            "SELECT question, COUNT(*), AVG(correct), AVG(seconds) FROM answers WHERE level = ? "
+            "GROUP BY question ORDER BY AVG(seconds) DESC LIMIT ?", (level, count)).fetchall()
+
+    def import_text(self, file_name):
+        """
+        Imports the results saved in the old "results.txt" format:
+        "name: 3/5 in level 1 (simple operations with numbers 2-9)."
+
+        :param file_name: str, file name
+        :return: int, the number of imported results.
+        """
+        imported = 0
+        with open(file_name, "r") as file:
+            for line in file:
+                match = RESULT_LINE.match(line)
+                if match:
+                    # The old file has no dates, so imported results are saved without one.
+                    self.pending.append((match["name"], int(match["score"]), int(match["total"]),
+                                         int(match["level"]), None))
+                    imported += 1
+                    if len(self.pending) >= self.batch_size:
+                        self.flush()
+        self.flush()
+        return imported
+
+
+def main():
+    """
+    Queries the store from the command line:
+    python results_store.py top <level> [count]
+    python results_store.py history <name>
+    python results_store.py times <level> [count]
+    python results_store.py import <results.txt>
+    """
+    with ResultsStore() as store:
+        if len(sys.argv) in [3, 4] and sys.argv[1] == "top":
+            count = int(sys.argv[3]) if len(sys.argv) == 4 else 10
+            for name, score, total in store.top_scores(int(sys.argv[2]), count):
+                print(f"{name}: {score}/{total}")
+        elif len(sys.argv) == 3 and sys.argv[1] == "history":
+            for score, total, level, created in store.history(sys.argv[2]):
+                print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(created)) if created else '-'}: "
+                      f"{score}/{total} in level {level}")
+        elif len(sys.argv) in [3, 4] and sys.argv[1] == "times":
+            count = int(sys.argv[3]) if len(sys.argv) == 4 else 10
+            for question, answers, right, seconds in store.answer_times(int(sys.argv[2]), count):
+                print(f"{question}: {seconds:.2f} s on average, {right:.0%} right of {answers} answers")
+        elif len(sys.argv) == 3 and sys.argv[1] == "import":
+            print(f"Imported {store.import_text(sys.argv[2])} results.")
+        else:
+            print(main.__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Task bank for arithmetic_test"""
+
+import operator
+import random
+from array import array
+
+OPERATIONS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+}
+
+
+def simple_tasks(low, high, operations='+-*'):
+    """
+    Lists every task with two numbers from low to high and one of the operations.
+
+    :param low: int, the smallest number.
+    :param high: int, the biggest number.
+    :param operations: str, operation signs from OPERATIONS.
+    :return: list of tuples with a str for the question and int for the answer.
+    """
+    return [(f"{num1} {sign} {num2}", OPERATIONS[sign](num1, num2))
+            for num1 in range(low, high + 1)
+            for sign in operations
+            for num2 in range(low, high + 1)]
+
+
+def square_tasks(low, high):
+    """
+    Lists every integral square task for numbers from low to high.
+
+    :param low: int, the smallest number.
+    :param high: int, the biggest number.
+    :return: list of tuples with a str for the question and int for the answer.
+    """
+    return [(f"{num}", num ** 2) for num in range(low, high + 1)]
+
+
+class TaskBank:
+    """
+    All tasks of one level, worked out once: the questions are kept in a tuple and the answers
+    in a compact array, so picking a task is just picking an index.
+    """
+    def __init__(self, tasks):
+        """
+        :param tasks: list of tuples with a str for the question and int for the answer.
+        """
+        self.questions = tuple(question for question, _ in tasks)
+        self.answers = array('q', (answer for _, answer in tasks))
+
+    def __len__(self):
+        """
+        :return: int, the number of tasks in the bank.
+        """
+        return len(self.questions)
+
+    def task(self, index):
+        """
+        :param index: int, the number of the task in the bank.
+        :return: tuple with a str for the question and int for the answer.
+        """
+        return self.questions[index], self.answers[index]
+
+    def sample(self, rng=random):
+        """
+        Picks a random task.
+
+        :param rng: random.Random or the random module.
+        :return: tuple with a str for the question and int for the answer.
+        """
+        return self.task(rng.randrange(len(self.questions)))
+
+    def sample_many(self, count, rng=random):
+        """
+        Picks several different tasks (without replacement).
+
+        :param count: int, how many tasks, not more than the size of the bank.
+        :param rng: random.Random or the random module.
+        :return: list of tuples with a str for the question and int for the answer.
+        """
+        return [self.task(index) for index in rng.sample(range(len(self.questions)), count)]
+
+
+# Levels: number -> (description, function that lists the tasks). Banks are built on first use.
+LEVELS = {
+    1: ("simple operations with numbers 2-9", lambda: simple_tasks(2, 9)),
+    2: ("integral squares of 11-29", lambda: square_tasks(11, 29)),
+}
+_banks = {}
+
+
+def add_level(level, description, make_tasks):
+    """
+    Adds a new level or replaces an existing one.
+
+    :param level: int, the number of the level.
+    :param description: str, shown to the user.
+    :param make_tasks: function without arguments that returns the list of tasks,
+                       for example lambda: simple_tasks(10, 99, '+-').
+    """
+    LEVELS[level] = (description, make_tasks)
+    _banks.pop(level, None)
+
+
+def get_bank(level):
+    """
+    Gives the task bank of the level, building it the first time it's needed.
+
+    :param level: int, the number of the level.
+    :return: TaskBank
+    """
+    if level not in _banks:
+        _banks[level] = TaskBank(LEVELS[level][1]())
+    return _banks[level]
+
+
+def describe(level):
+    """
+    :param level: int, the number of the level.
+    :return: str, the description of the level.
+    """
+    return LEVELS[level][0]
@@ -1,17 +1,41 @@
 """Project coffeemachine"""
 
+import os
+import threading
+
+from ledger import RESOURCES, Ledger
+from recipes import INGREDIENTS, find_shortage, load_recipes
+
+BREWING_MESSAGE = "I have enough resources, brewing you a coffee!"
+UNKNOWN_COFFEE_MESSAGE = "There is no such coffee on the menu!"
+LEDGER_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ledger")
+
 
 class CoffeeMachine:
     """This class represents a simple coffeemachine with such functions as serving clients and giving you the
-    collected money. It can serve 3 different types of coffee and needs filling once in a while."""
-    def __init__(self):
-        """Initialization of coffeemachine resources."""
+    collected money. It serves the coffee from its recipe registry and needs filling once in a while."""
+    def __init__(self, ledger=None, recipes=None):
+        """Initialization of coffeemachine resources. If a ledger is given, the machine is restored
+        from its latest snapshot and the events after it, and every change is written to it.
+        :arg: ledger (Ledger): optional event ledger.
+        :arg: recipes (RecipeRegistry): the menu, loaded from recipes.json by default."""
         self.water = 400
         self.milk = 540
         self.coffee_beans = 120
         self.disposable_cups = 9
         self.money = 550
         self.state = "waiting_for_action"
+        self.lock = threading.Lock()
+        self.ledger = ledger
+        self.recipes = recipes if recipes is not None else load_recipes()
+
+        if ledger is not None:
+            resources, events = ledger.recover()
+            if resources is not None:
+                for resource in RESOURCES:
+                    setattr(self, resource, resources[resource])
+            for event in events:
+                self.apply_event(event)
 
     def process_input(self, user_input):
         """Processes user input based on the current state of the machine
@@ -21,7 +45,10 @@ class CoffeeMachine:
         if self.state == "waiting_for_action":
             self.process_action(user_input)
         elif self.state == "choosing_coffee":
-            self.buy_coffee(int(user_input))
+            try:
+                self.buy_coffee(int(user_input))
+            except ValueError:
+                print(UNKNOWN_COFFEE_MESSAGE)
             self.state = "waiting_for_action"
         elif self.state == "filling":
             self.fill_supplies_prompt()
@@ -33,7 +60,7 @@ class CoffeeMachine:
         :arg: action (str): user's inputted action
         :returns: none"""
         if action == "buy":
-            print("What do you want to buy? 1 - espresso, 2 - latte, 3 - cappuccino:")
+            print(f"What do you want to buy? {self.recipes.menu()}:")
             self.state = "choosing_coffee"
         elif action == "fill":
             self.state = "filling"
@@ -48,70 +75,106 @@ class CoffeeMachine:
             print("Invalid action! Please try again.")
 
     def buy_coffee(self, choice):
-        """Processes the purchase of one of 3 types of coffee: espresso, latte and cappuccino.
-        Different types of coffee need different amount of ingredients, so the program first checks if you have
-        the right amount, then proceeds brewing you a coffee.
-        :arg: choice(int): 1- espresso, 2- latte, 3- cappuccino.
+        """Processes the purchase of a coffee from the menu and prints the result.
+        :arg: choice(int): id of the recipe, for example 1- espresso, 2- latte, 3- cappuccino.
         :returns: none"""
-        water_needed = 0
-        milk_needed = 0
-        coffee_beans_needed = 0
-        cost = 0
-
-        if choice == 1:  # espresso choice
-            water_needed = 250
-            coffee_beans_needed = 16
-            cost = 4
-        elif choice == 2:  # latte choice
-            water_needed = 350
-            milk_needed = 75
-            coffee_beans_needed = 20
-            cost = 7
-        elif choice == 3:  # cappuccino choice
-            water_needed = 200
-            milk_needed = 100
-            coffee_beans_needed = 12
-            cost = 6
-
-        if self.water < water_needed:
-            print("Sorry, not enough water!")
-        elif self.milk < milk_needed:
-            print("Sorry, not enough milk!")
-        elif self.coffee_beans < coffee_beans_needed:
-            print("Sorry, not enough coffee beans!")
-        elif self.disposable_cups < 1:
-            print("Sorry, not enough disposable cups!")
-        else:
-            print("I have enough resources, brewing you a coffee!")
-            self.water -= water_needed
-            self.milk -= milk_needed
-            self.coffee_beans -= coffee_beans_needed
-            self.disposable_cups -= 1
-            self.money += cost
+        print(self.make_coffee(choice))
+
+    def make_coffee(self, choice):
+        """Different types of coffee need different amount of ingredients, so the program first checks if you have
+        the right amount, then proceeds brewing you a coffee. The check and the deduction happen under the
+        machine's lock, so orders coming from several threads can't use the same ingredients twice.
+        :arg: choice(int): id of the recipe.
+        :returns: str, the message for the client."""
+        if choice not in self.recipes:
+            return UNKNOWN_COFFEE_MESSAGE
+        return self._sell([choice], self.recipes.needs[choice], self.recipes.costs[choice], BREWING_MESSAGE)
+
+    def buy_many(self, orders):
+        """Sells a whole basket of coffee at once: the ingredients of all orders are added up and checked
+        in one pass, and either every order is brewed or none of them.
+        :arg: orders (list): recipe ids.
+        :returns: str, the message for the client."""
+        if not orders:
+            return "The basket is empty!"
+        if any(choice not in self.recipes for choice in orders):
+            return UNKNOWN_COFFEE_MESSAGE
+        needs, cost = self.recipes.basket(orders)
+        return self._sell(orders, needs, cost, f"I have enough resources, brewing you {len(orders)} coffees!")
+
+    def _sell(self, choices, needs, cost, message):
+        """Checks the supplies against the needed ingredients and records the sale under the lock.
+        :arg: choices (list): recipe ids of the sold coffee.
+        :arg: needs (tuple): amounts of INGREDIENTS.
+        :arg: cost (int): the price.
+        :arg: message (str): what to say if everything is enough.
+        :returns: str, the message for the client."""
+        with self.lock:
+            shortage = find_shortage(self.supplies(), needs)
+            if shortage is not None:
+                return f"Sorry, not enough {shortage.replace('_', ' ')}!"
+            event = {"type": "sale", "choices": choices, "money": cost}
+            for ingredient, amount in zip(INGREDIENTS, needs):
+                event[ingredient] = -amount
+            self._record(event)
+        return message
+
+    def supplies(self):
+        """:returns: tuple with the amounts of INGREDIENTS in the machine."""
+        return tuple(getattr(self, ingredient) for ingredient in INGREDIENTS)
 
     def fill_supplies_prompt(self):
         """Is used to update the machine's supplies when it runs out of some ingredient.
         :returns: none."""
         try:
             print("How many ml of water do you want to add:")
-            self.water += int(input())
+            water = int(input())
             print("How many ml of milk do you want to add:")
-            self.milk += int(input())
+            milk = int(input())
             print("How many grams of coffee beans do you want to add:")
-            self.coffee_beans += int(input())
+            coffee_beans = int(input())
             print("How many disposable cups of coffee do you want to add:")
-            self.disposable_cups += int(input())
+            disposable_cups = int(input())
+            self.fill_supplies(water, milk, coffee_beans, disposable_cups)
             self.state = "waiting_for_action"
         except ValueError:
             print("Invalid input! Please enter a valid number.")
             self.fill_supplies_prompt()
 
+    def fill_supplies(self, water, milk, coffee_beans, disposable_cups):
+        """Adds supplies to the machine all at once.
+        :arg: water, milk, coffee_beans, disposable_cups (int): amounts to add.
+        :returns: none"""
+        with self.lock:
+            self._record({"type": "fill", "water": water, "milk": milk,
+                          "coffee_beans": coffee_beans, "disposable_cups": disposable_cups})
+
     def take_money(self):
         """Gives you all the collected money from the coffeemachine
         (actually just resets the money count)
         :returns: none"""
-        print(f"I gave you ${self.money}")
-        self.money = 0
+        with self.lock:
+            money = self.money
+            self._record({"type": "take", "money": -money})
+        print(f"I gave you ${money}")
+
+    def apply_event(self, event):
+        """Changes the resources by the amounts in the event, resources missing from it stay the same.
+        :arg: event (dict): a sale, fill or take event.
+        :returns: none"""
+        for resource in RESOURCES:
+            if resource in event:
+                setattr(self, resource, getattr(self, resource) + event[resource])
+
+    def _record(self, event):
+        """Applies the event and writes it to the ledger, if there is one. Must be called under the lock.
+        :arg: event (dict): a sale, fill or take event.
+        :returns: none"""
+        self.apply_event(event)
+        if self.ledger is not None:
+            self.ledger.append(event)
+            if self.ledger.needs_snapshot():
+                self.ledger.snapshot({resource: getattr(self, resource) for resource in RESOURCES})
 
     def print_supplies(self):
         """Prints the current ingredients available for brewing coffee.
@@ -126,7 +189,7 @@ class CoffeeMachine:
 
 def main():
     """The main function that runs the coffeemachine program."""
-    coffee_machine = CoffeeMachine()
+    coffee_machine = CoffeeMachine(Ledger(LEDGER_DIRECTORY))
 
     while True:
         action = input("Write action (buy, fill, take, remaining, exit): ").strip()
@@ -0,0 +1,111 @@
+"""Event ledger for the coffeemachine"""
+
+import json
+import os
+import time
+
+RESOURCES = ("water", "milk", "coffee_beans", "disposable_cups", "money")
+
+
+class Ledger:
+    """This class keeps every change of a coffeemachine as an event in an append-only JSON-lines log.
+    Every snapshot_every events it writes a snapshot of the whole machine and moves the log aside
+    into an archive file, so a restart only reads the snapshot and the events written after it,
+    while the archive keeps the audit trail of every sale.
+
+    Files in the directory:
+    snapshot.json - the latest snapshot: {"seq": number of the last event in it, "resources": {...}};
+    events.log - events after the snapshot, one JSON object per line;
+    events.<first seq>.log - archived events."""
+    def __init__(self, directory, snapshot_every=1000):
+        """Initialization of the ledger, creates the directory if needed.
+        :arg: directory (str): where to keep the files.
+        :arg: snapshot_every (int): how many events to write between snapshots."""
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.snapshot_path = os.path.join(directory, "snapshot.json")
+        self.log_path = os.path.join(directory, "events.log")
+        os.makedirs(directory, exist_ok=True)
+        self.seq = 0
+        self.events_since_snapshot = 0
+        self._log = None
+        self._log_start = None
+
+    def recover(self):
+        """Reads the latest snapshot and the events written after it.
+        :returns: tuple: dict of resources from the snapshot (None if there's no snapshot yet),
+        list of events to replay in order."""
+        resources = None
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as file:
+                snapshot = json.load(file)
+            resources = snapshot["resources"]
+            snapshot_seq = snapshot["seq"]
+
+        events = []
+        self._log_start = None
+        if os.path.exists(self.log_path):
+            good_size = 0
+            with open(self.log_path, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break  # the last line was cut off by a crash
+                    good_size += len(line)
+                    event = json.loads(line)
+                    if self._log_start is None:
+                        self._log_start = event["seq"]
+                    if event["seq"] > snapshot_seq:
+                        events.append(event)
+            if good_size < os.path.getsize(self.log_path):
+                os.truncate(self.log_path, good_size)
+        self.seq = events[-1]["seq"] if events else snapshot_seq
+        self.events_since_snapshot = len(events)
+        return resources, events
+
+    def append(self, event):
+        """Writes one event to the end of the log.
+        :arg: event (dict): the event, gets its sequence number and time added.
+        :returns: none"""
+        if self._log is None:
+            self._log = open(self.log_path, "a")
+        if self._log_start is None:
+            self._log_start = self.seq + 1
+        self.seq += 1
+        event["seq"] = self.seq
+        event["time"] = round(time.time(), 3)
+        self._log.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self._log.flush()
+        self.events_since_snapshot += 1
+
+    def needs_snapshot(self):
+        """:returns: bool, True if it's time for a new snapshot."""
+        return self.events_since_snapshot >= self.snapshot_every
+
+    def snapshot(self, resources):
+        """Writes a snapshot of the machine and archives the events it covers.
+        The snapshot is written to a temporary file and then renamed, so a crash never leaves half of it.
+        :arg: resources (dict): the current value of every resource.
+        :returns: none"""
+        temporary_path = self.snapshot_path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump({"seq": self.seq, "resources": resources}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if os.path.exists(self.log_path):
+            start = self._log_start if self._log_start is not None else self.seq
+            os.replace(self.log_path, os.path.join(self.directory, f"events.{start}.log"))
+        self._log_start = None
+        self.events_since_snapshot = 0
+
+    def close(self):
+        """Closes the log file.
+        :returns: none"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
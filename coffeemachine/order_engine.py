@@ -0,0 +1,105 @@
+"""Concurrent order processing for a fleet of coffeemachines"""
+
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from coffeemachine import BREWING_MESSAGE, CoffeeMachine
+
+
+class OrderEngine:
+    """This class serves orders for a fleet of coffeemachines from several threads.
+    Orders are put into a queue and taken by a pool of workers. Every order is checked and paid for
+    under the lock of its machine, so the ingredients for it are reserved all at once and a machine
+    never sells more than it has."""
+    def __init__(self, machines, workers=4):
+        """Initialization of the engine, starts the workers.
+        :arg: machines (list): CoffeeMachine objects, an order refers to a machine by its index.
+        :arg: workers (int): the number of worker threads."""
+        self.machines = machines
+        self.orders = queue.Queue()
+        self.served = 0
+        self.refused = 0
+        self._stats_lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self):
+        """Lets the engine be used in a with block.
+        :returns: the engine itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Shuts the engine down at the end of the with block, after the queued orders are served.
+        :returns: none"""
+        self.shutdown()
+
+    def submit(self, machine_id, choice):
+        """Puts an order into the queue.
+        :arg: machine_id (int): index of the machine.
+        :arg: choice (int): 1- espresso, 2- latte, 3- cappuccino.
+        :returns: Future with the machine's message for the client."""
+        future = Future()
+        self.orders.put((machine_id, choice, future))
+        return future
+
+    def submit_many(self, orders):
+        """Puts many orders into the queue.
+        :arg: orders (iterable): (machine_id, choice) pairs.
+        :returns: list of Futures in the same order."""
+        return [self.submit(machine_id, choice) for machine_id, choice in orders]
+
+    def shutdown(self):
+        """Waits until every queued order is served and stops the workers.
+        :returns: none"""
+        for _ in self._workers:
+            self.orders.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _work(self):
+        """The loop of a worker thread: takes orders until it gets None."""
+        while True:
+            order = self.orders.get()
+            if order is None:
+                return
+            machine_id, choice, future = order
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                message = self.machines[machine_id].make_coffee(choice)
+            except Exception as error:
+                future.set_exception(error)
+                continue
+            with self._stats_lock:
+                if message == BREWING_MESSAGE:
+                    self.served += 1
+                else:
+                    self.refused += 1
+            future.set_result(message)
+
+
+def main():
+    """A load test: sends random orders to a fleet of machines and checks that nothing was oversold."""
+    machines = [CoffeeMachine() for _ in range(100)]
+    for machine in machines:
+        machine.fill_supplies(100000, 100000, 10000, 500)
+    orders = [(random.randrange(len(machines)), random.randint(1, 3)) for _ in range(100000)]
+
+    start = time.perf_counter()
+    with OrderEngine(machines, workers=8) as engine:
+        engine.submit_many(orders)
+    seconds = time.perf_counter() - start
+
+    print(f"{len(orders)} orders in {seconds:.2f} s ({len(orders) / seconds:.0f} orders per second)")
+    print(f"Served: {engine.served}, refused: {engine.refused}")
+    oversold = [machine for machine in machines
+                if min(machine.water, machine.milk, machine.coffee_beans, machine.disposable_cups) < 0]
+    print(f"Machines with negative supplies: {len(oversold)}")
+
+
+if __name__ == "__main__":
+    main()
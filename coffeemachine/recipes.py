@@ -0,0 +1,77 @@
+"""Recipe registry for the coffeemachine"""
+
+import json
+import os
+
+INGREDIENTS = ("water", "milk", "coffee_beans", "disposable_cups")
+RECIPES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recipes.json")
+
+
+class RecipeRegistry:
+    """This class keeps the menu of the coffeemachine. Every recipe is stored as a tuple of the amounts
+    of INGREDIENTS it needs plus its cost, so checking and deducting an order is a single pass
+    over one vector of numbers instead of a branch per coffee type."""
+    def __init__(self, recipes):
+        """Initialization of the registry.
+        :arg: recipes (list): dicts with "id", "name", "cost" and the amounts of ingredients
+        (ingredients that aren't mentioned aren't needed)."""
+        self.names = {}
+        self.needs = {}
+        self.costs = {}
+        for recipe in recipes:
+            unknown = set(recipe) - set(INGREDIENTS) - {"id", "name", "cost"}
+            if unknown:
+                raise ValueError(f"Unknown ingredients in recipe {recipe.get('name')}: {', '.join(sorted(unknown))}")
+            choice = recipe["id"]
+            self.names[choice] = recipe["name"]
+            self.needs[choice] = tuple(recipe.get(ingredient, 0) for ingredient in INGREDIENTS)
+            self.costs[choice] = recipe["cost"]
+
+    def __contains__(self, choice):
+        """:arg: choice (int): id of a recipe.
+        :returns: bool, whether the recipe is on the menu."""
+        return choice in self.needs
+
+    def menu(self):
+        """:returns: str, the menu like "1 - espresso, 2 - latte"."""
+        return ", ".join(f"{choice} - {name}" for choice, name in self.names.items())
+
+    def basket(self, choices):
+        """Sums up the ingredients and the cost of a whole basket of orders.
+        :arg: choices (iterable): recipe ids, they must all be on the menu.
+        :returns: tuple: tuple of the amounts of INGREDIENTS, int total cost."""
+        totals = [0] * len(INGREDIENTS)
+        cost = 0
+        counts = {}
+        for choice in choices:
+            counts[choice] = counts.get(choice, 0) + 1
+        for choice, count in counts.items():
+            for i, amount in enumerate(self.needs[choice]):
+                totals[i] += amount * count
+            cost += self.costs[choice] * count
+        return tuple(totals), cost
+
+
+def load_recipes(file_name=RECIPES_PATH):
+    """
+    Loads the registry from a JSON file: {"recipes": [{"id": 1, "name": "espresso", "water": 250, ...}, ...]}
+
+    :param file_name: str, file name
+    :return: RecipeRegistry
+    """
+    with open(file_name, "r") as file:
+        return RecipeRegistry(json.load(file)["recipes"])
+
+
+def find_shortage(supplies, needs):
+    """
+    Compares the supplies with the needed amounts, ingredient by ingredient.
+
+    :param supplies: sequence of the amounts of INGREDIENTS in the machine.
+    :param needs: sequence of the needed amounts of INGREDIENTS.
+    :return: str, the first ingredient that isn't enough, or None if everything is enough.
+    """
+    for ingredient, have, need in zip(INGREDIENTS, supplies, needs):
+        if have < need:
+            return ingredient
+    return None
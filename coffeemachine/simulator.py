@@ -0,0 +1,167 @@
+"""Inventory consumption simulator and restock forecaster for the coffeemachine"""
+
+import bisect
+import itertools
+import random
+import time
+
+from recipes import INGREDIENTS, load_recipes
+
+CHUNK_SIZE = 4096
+
+
+def orders_until_stockout(supplies, recipes, mix, rng=random):
+    """
+    Draws random orders until the machine can't serve one any more. The orders are drawn in chunks with
+    random.choices, and the running total of every ingredient is counted with itertools.accumulate,
+    so no Python code runs per order: the first order that doesn't fit is found with bisect.
+
+    :param supplies: tuple with the amounts of INGREDIENTS in the machine.
+    :param recipes: RecipeRegistry, the menu.
+    :param mix: dict, recipe id -> how often it's ordered (any positive weights).
+    :param rng: random.Random, the source of random numbers.
+    :return: tuple: int number of orders served before the stock-out, str the ingredient that ran out.
+    """
+    choices = list(mix)
+    weights = [mix[choice] for choice in choices]
+    needs = [recipes.needs[choice] for choice in choices]
+    used = [ingredient for ingredient in range(len(INGREDIENTS)) if any(need[ingredient] for need in needs)]
+    if not used:
+        raise ValueError("The menu mix doesn't use any ingredient, the machine never runs out.")
+
+    total_weight = sum(weights)
+    average_needs = [sum(weight * need[ingredient] for weight, need in zip(weights, needs)) / total_weight
+                     for ingredient in range(len(INGREDIENTS))]
+
+    served = 0
+    remaining = list(supplies)
+    while True:
+        # Draws a bit more than the expected number of orders left, so small machines don't waste draws.
+        expected = min(remaining[ingredient] / average_needs[ingredient] for ingredient in used)
+        chunk_size = max(16, min(CHUNK_SIZE, int(expected * 1.25) + 1))
+        drawn = rng.choices(range(len(choices)), weights, k=chunk_size)
+        stockout = None
+        for ingredient in used:
+            amounts = [need[ingredient] for need in needs]
+            totals = list(itertools.accumulate(map(amounts.__getitem__, drawn)))
+            position = bisect.bisect_right(totals, remaining[ingredient])
+            if position < chunk_size and (stockout is None or position < stockout[0]):
+                stockout = (position, INGREDIENTS[ingredient])
+            remaining[ingredient] -= totals[-1]
+        if stockout is not None:
+            return served + stockout[0], stockout[1]
+        served += chunk_size
+
+
+def simulate_machine(supplies, rate, mix, recipes, trials=100, rng=random):
+    """
+    Predicts when a machine runs out with Poisson order arrivals. The time of the n-th order of a Poisson
+    stream is a gamma variable, so a single draw gives the stock-out time once the order count is known.
+
+    :param supplies: tuple with the amounts of INGREDIENTS in the machine.
+    :param rate: float, orders per hour.
+    :param mix: dict, recipe id -> how often it's ordered.
+    :param recipes: RecipeRegistry, the menu.
+    :param trials: int, the number of simulated futures.
+    :param rng: random.Random, the source of random numbers.
+    :return: tuple: sorted list of stock-out times in hours, dict ingredient -> how many times it ran out first,
+             int number of simulated orders.
+    """
+    hours = []
+    causes = {}
+    orders = 0
+    for _ in range(trials):
+        served, ingredient = orders_until_stockout(supplies, recipes, mix, rng)
+        hours.append(rng.gammavariate(served + 1, 1 / rate))
+        causes[ingredient] = causes.get(ingredient, 0) + 1
+        orders += served + 1
+    hours.sort()
+    return hours, causes, orders
+
+
+def replay_orders(orders, supplies, recipes):
+    """
+    Replays a recorded stream of orders against the supplies.
+
+    :param orders: list of (hours, recipe id) in time order.
+    :param supplies: tuple with the amounts of INGREDIENTS in the machine.
+    :param recipes: RecipeRegistry, the menu.
+    :return: tuple: hours of the first order that couldn't be served and the ingredient that ran out,
+             or None if every order was served.
+    """
+    stockout = None
+    for ingredient, supply in enumerate(supplies):
+        totals = itertools.accumulate(recipes.needs[choice][ingredient] for _, choice in orders)
+        position = bisect.bisect_right(list(totals), supply)
+        if position < len(orders) and (stockout is None or position < stockout[0]):
+            stockout = (position, INGREDIENTS[ingredient])
+    if stockout is None:
+        return None
+    return orders[stockout[0]][0], stockout[1]
+
+
+def plan_restock(stockout_hours, risk=0.05):
+    """
+    Chooses how often to restock so that a machine runs out before the restock only with the given risk:
+    the restock interval is that quantile of the simulated stock-out times.
+
+    :param stockout_hours: sorted list of simulated stock-out times.
+    :param risk: float, acceptable chance of a stock-out between restocks.
+    :return: float, hours between restocks.
+    """
+    return stockout_hours[min(int(risk * len(stockout_hours)), len(stockout_hours) - 1)]
+
+
+def simulate_fleet(fleet, recipes, trials=100, risk=0.05, seed=None):
+    """
+    Simulates a whole fleet and plans restocks for every machine.
+
+    :param fleet: list of dicts with "supplies" (tuple of INGREDIENTS), "rate" (orders per hour)
+                  and "mix" (recipe id -> weight).
+    :param recipes: RecipeRegistry, the menu.
+    :param trials: int, simulated futures per machine.
+    :param risk: float, acceptable chance of a stock-out between restocks.
+    :param seed: int, makes the simulation reproducible.
+    :return: tuple: list of dicts with "median_stockout", "restock_every" and "runs_out_of" per machine,
+             int number of simulated orders.
+    """
+    rng = random.Random(seed)
+    plans = []
+    total_orders = 0
+    for machine in fleet:
+        hours, causes, orders = simulate_machine(machine["supplies"], machine["rate"], machine["mix"],
+                                                 recipes, trials, rng)
+        total_orders += orders
+        plans.append({
+            "median_stockout": hours[len(hours) // 2],
+            "restock_every": plan_restock(hours, risk),
+            "runs_out_of": max(causes, key=causes.get),
+        })
+    return plans, total_orders
+
+
+def main():
+    """Simulates a synthetic fleet of 1000 machines and prints the restock plan summary."""
+    recipes = load_recipes()
+    rng = random.Random(1)
+    fleet = [{
+        "supplies": (rng.randint(20000, 60000), rng.randint(5000, 20000), rng.randint(1000, 5000), 200),
+        "rate": rng.uniform(2, 30),
+        "mix": {choice: rng.random() for choice in recipes.needs},
+    } for _ in range(1000)]
+
+    start = time.perf_counter()
+    plans, orders = simulate_fleet(fleet, recipes, trials=50, seed=2)
+    seconds = time.perf_counter() - start
+
+    print(f"Simulated {orders} orders in {seconds:.2f} s ({orders / seconds:.0f} orders per second)")
+    intervals = sorted(plan["restock_every"] for plan in plans)
+    print(f"Restock interval: shortest {intervals[0]:.1f} h, median {intervals[len(intervals) // 2]:.1f} h, "
+          f"longest {intervals[-1]:.1f} h")
+    for ingredient in INGREDIENTS:
+        count = sum(plan["runs_out_of"] == ingredient for plan in plans)
+        print(f"{count} machines usually run out of {ingredient.replace('_', ' ')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Microbenchmark of Dinner-party bill splitting"""
+import random
+import timeit
+
+from bill_splitter import split_party
+from dinnerparty import split_bill
+
+PARTY_SIZES = [2, 5, 20, 100]
+NUMBER = 20000
+
+
+def per_party_microseconds(statement, number=NUMBER):
+    """Times a statement with timeit and takes the best of 5 runs.
+    Returns: float, microseconds per call."""
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1_000_000
+
+
+def main():
+    """Prints how long one party takes to split, as the billing pipeline calls it:
+    split_bill with and without a lucky one, and split_party from the batch splitter."""
+    rng = random.Random(1)
+    print(f"{'friends':>8} {'split_bill':>12} {'lucky one':>12} {'split_party':>12}")
+    for size in PARTY_SIZES:
+        names = [f"friend{i}" for i in range(size)]
+        party = {"id": 1, "total": "1234.56", "friends": names}
+        plain = per_party_microseconds(lambda: split_bill(names, "1234.56"))
+        lucky = per_party_microseconds(lambda: split_bill(names, "1234.56", True, rng))
+        batch = per_party_microseconds(lambda: split_party(party))
+        print(f"{size:>8} {plain:>10.2f}us {lucky:>10.2f}us {batch:>10.2f}us")
+
+
+if __name__ == "__main__":
+    main()
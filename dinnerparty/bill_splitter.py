@@ -0,0 +1,154 @@
+"""Batch bill splitting for Dinner-party"""
+import csv
+import json
+import sys
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+
+def to_cents(amount):
+    """Converts an amount of money to a whole number of cents, without float rounding errors.
+    Accepts "12.34", 12.34 or 12. Fractions of a cent are rounded half up.
+    Returns: int."""
+    try:
+        return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"Not an amount of money: {amount!r}")
+
+
+def format_cents(cents):
+    """Formats cents as an amount of money, like "12.05".
+    Returns: str."""
+    sign = "-" if cents < 0 else ""
+    return f"{sign}{abs(cents) // 100}.{abs(cents) % 100:02d}"
+
+
+def split_cents(total_cents, weights):
+    """Splits the bill between friends by their weights with the largest remainder method:
+    1. Everybody gets the whole cents of their exact share.
+    2. The cents that are left go one by one to the friends with the largest remainders
+    (the earlier friend wins a tie).
+    So the shares always add up to the bill exactly.
+    Weights should be whole numbers that are not negative.
+    Returns: list of int, the share of every friend in cents."""
+    for weight in weights:
+        if not isinstance(weight, int) or isinstance(weight, bool) or weight < 0:
+            raise ValueError(f"A weight should be a whole number that is not negative: {weight!r}")
+    total_weight = sum(weights)
+    if total_weight <= 0:
+        raise ValueError("At least one friend has to pay.")
+    shares = []
+    remainders = []
+    for i, weight in enumerate(weights):
+        share, remainder = divmod(total_cents * weight, total_weight)
+        shares.append(share)
+        remainders.append((-remainder, i))
+    for _, i in sorted(remainders)[:total_cents - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def split_party(party):
+    """Splits the bill of one party.
+    party is a dictionary:
+    "total": the bill, like "123.45";
+    "friends": a list of names (equal shares) or a dictionary of names and their weights;
+    "lucky": optional, the name of the lucky one who doesn't pay;
+    other keys (like "id") are copied to the result.
+    Returns: dictionary with the same other keys and "shares": names and their shares as strings."""
+    friends = party["friends"]
+    if not isinstance(friends, dict):
+        friends = {name: 1 for name in friends}
+    lucky_one = party.get("lucky")
+    if lucky_one is not None and lucky_one not in friends:
+        raise ValueError(f"The lucky one {lucky_one!r} isn't at the party.")
+
+    names = list(friends)
+    weights = [0 if name == lucky_one else friends[name] for name in names]
+    shares = split_cents(to_cents(party["total"]), weights)
+
+    result = {key: value for key, value in party.items() if key not in ["total", "friends", "lucky"]}
+    result["shares"] = {name: format_cents(share) for name, share in zip(names, shares)}
+    return result
+
+
+def read_csv_rows(lines):
+    """Reads rows from CSV lines with a header: id,total,friends,lucky.
+    Returns: generator of tuples (line number, row dictionary)."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def parse_csv_row(row):
+    """Makes a party of a CSV row.
+    friends are separated by ";" and may have a weight after ":", like "Ann:2;Bob;Cid".
+    Returns: party dictionary."""
+    if not row.get("id") or row.get("total") is None or row.get("friends") is None:
+        raise ValueError("The row should have an id, a total and friends.")
+    friends = {}
+    for friend in row["friends"].split(";"):
+        name, _, weight = friend.partition(":")
+        if weight and not weight.strip().isdigit():
+            raise ValueError(f"The weight of {name.strip()!r} should be a whole number: {weight!r}")
+        friends[name.strip()] = int(weight) if weight else 1
+    party = {"id": row["id"], "total": row["total"], "friends": friends}
+    if row.get("lucky"):
+        party["lucky"] = row["lucky"].strip()
+    return party
+
+
+def read_json_lines(lines):
+    """Reads JSON lines, one party per line (empty lines are skipped).
+    Returns: generator of tuples (line number, line)."""
+    for line_number, line in enumerate(lines, 1):
+        if line.strip():
+            yield line_number, line
+
+
+def parse_json_line(line):
+    """Makes a party of a JSON line.
+    Returns: party dictionary."""
+    party = json.loads(line)
+    if not isinstance(party, dict):
+        raise ValueError("A party should be a JSON object.")
+    return party
+
+
+def split_stream(records, parse, output):
+    """Parses and splits every party and writes the results as JSON lines, one party at a time,
+    so the memory doesn't grow with the number of parties.
+    A party that can't be parsed or split gets an "error" and its line number instead of "shares",
+    and the stream goes on.
+    records: tuples (line number, raw record), from read_csv_rows or read_json_lines.
+    parse: function that makes a party of a raw record, parse_csv_row or parse_json_line.
+    Returns: int, the number of parties."""
+    count = 0
+    for line_number, record in records:
+        party = None
+        try:
+            party = parse(record)
+            result = split_party(party)
+        except (KeyError, TypeError, ValueError) as error:
+            known = party if party is not None else record if isinstance(record, dict) else {}
+            result = {"id": known.get("id"), "line": line_number, "error": str(error)}
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def main():
+    """Command line: python bill_splitter.py [parties.csv | parties.jsonl]
+    Reads the parties from the file (or JSON lines from the standard input)
+    and writes the splits to the standard output as JSON lines."""
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r", newline="") as file:
+            if sys.argv[1].endswith(".csv"):
+                split_stream(read_csv_rows(file), parse_csv_row, sys.stdout)
+            else:
+                split_stream(read_json_lines(file), parse_json_line, sys.stdout)
+    else:
+        split_stream(read_json_lines(sys.stdin), parse_json_line, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,28 @@
 """"Project Dinner-party"""
 import random
+import sys
 
+from bill_splitter import split_cents, to_cents
 
-def add_friends():
-    """The main program function. Works by this algorythm:
+
+def split_bill(names, total, lucky=False, rng=random):
+    """Splits the bill between friends without asking or printing anything.
+    The bill is split in whole cents, so the shares add up to it exactly.
+    If lucky is True, a lucky one is chosen with rng and their part is shared among the others
+    (a party of one has no lucky one). Pass random.Random(seed) as rng to get the same lucky one every time.
+    Returns: tuple: dictionary with friends' names and their shares, the lucky one or None."""
+    names = list(dict.fromkeys(names))
+    if not names:
+        raise ValueError("No one is joining the party.")
+
+    lucky_one = rng.choice(names) if lucky and len(names) > 1 else None
+    weights = [0 if name == lucky_one else 1 for name in names]
+    shares = split_cents(to_cents(total), weights)
+    return {name: share / 100 for name, share in zip(names, shares)}, lucky_one
+
+
+def add_friends(rng=random):
+    """The main program function, the command line wrapper of split_bill. Works by this algorythm:
     1. Asks user to input the number of their friends joining
     the dinner.
     2. Asks user to enter their names.
@@ -12,7 +31,7 @@ def add_friends():
     4. Asks user to input the bill, calculates the share per peron and updates
     it in the dictionary.
     5. Additionally, it has a "Lucky one" function that randomly chooses a lucky one among the
-    friends. This person won't pay their part, instead it will be shared among their friends.
+    friends (with rng). This person won't pay their part, instead it will be shared among their friends.
     6. Prints the dictionary with friends' names and their respective bill shares.
     Returns: none.
     """
@@ -27,25 +46,18 @@ def add_friends():
             friend_name = input(f"Enter the name of your friend №{i+1}!>\n!")
             friends_dict[friend_name] = 0
         print(friends_dict)
-        total_amount = float(input(f"Enter the total amount!>\n"))
+        total_amount = input(f"Enter the total amount!>\n")
         lucky_choice = str(input("Wanna choose a lucky one? Yes/No>"))
 
-        if lucky_choice == "Yes":
-            lucky_one = random.choice(list(friends_dict.keys()))
+        if lucky_choice == "Yes" and len(friends_dict) == 1:
+            print("There's no one to pay for the lucky one!")
+        friends_dict, lucky_one = split_bill(friends_dict, total_amount, lucky_choice == "Yes", rng)
+        if lucky_one is not None:
             print(f"{lucky_one} is the lucky one!")
 
-            for friend in friends_dict:
-                if friend != lucky_one:
-                    friends_dict[friend] = round(total_amount / (num_friends - 1), 2)
-                else:
-                    friends_dict[friend] = 0
-        else:
-            share_per_person = round(total_amount / num_friends, 2)
-            for friend in friends_dict:
-                friends_dict[friend] = share_per_person
-
         print(friends_dict)
 
 
-add_friends()
-
+if __name__ == "__main__":
+    # An optional seed makes the lucky one reproducible: python dinnerparty.py 42
+    add_friends(random.Random(int(sys.argv[1])) if len(sys.argv) > 1 else random)
@@ -0,0 +1,147 @@
+"""Benchmark of Hangman solvers"""
+
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import hangman
+import solver
+
+ENGLISH_LETTERS = "etaoinshrdlcumwfgypbvkjxqz"
+CHUNK_SIZE = 500
+
+
+class FrequencySolver:
+    """This class is the simplest strategy to compare with: it always guesses letters
+    in the order of their frequency in English."""
+    def __init__(self, index, length):
+        """Initialization of the solver, it doesn't use the dictionary."""
+        self._letters = iter(ENGLISH_LETTERS)
+
+    def next_guess(self):
+        """:returns: str, the next letter."""
+        return next(self._letters)
+
+    def update(self, letter, display):
+        """Nothing to learn from the answer."""
+
+
+STRATEGIES = {
+    "entropy": solver.HangmanSolver,
+    "frequency": FrequencySolver,
+}
+
+# Every worker process builds its own index once, in _init_worker.
+_index = None
+_strategy = None
+
+
+def _init_worker(words, strategy):
+    """
+    Prepares a worker process: indexes the dictionary and remembers the strategy.
+
+    :param words: list of words.
+    :param strategy: str, a key of STRATEGIES.
+    """
+    global _index, _strategy
+    _index = solver.WordIndex(words)
+    _strategy = STRATEGIES[strategy]
+
+
+def play_word(word):
+    """
+    Plays one game against the word with the current strategy, using hangman.step.
+
+    :param word: str, the word to guess.
+    :return: tuple: (word, bool won, int attempts used, int letters guessed, float seconds).
+    """
+    start = time.perf_counter()
+    player = _strategy(_index, len(word))
+    state = hangman.HangmanState(word)
+    guesses = 0
+    while state.attempts > 0 and not state.is_won():
+        guess = player.next_guess()
+        state, _ = hangman.step(state, guess)
+        player.update(guess, state.display())
+        guesses += 1
+    return word, state.is_won(), hangman.ATTEMPTS - state.attempts, guesses, time.perf_counter() - start
+
+
+def _play_chunk(words):
+    """
+    Plays a chunk of words in a worker, so the pool doesn't send every game separately.
+
+    :param words: list of words.
+    :return: list of play_word results.
+    """
+    return [play_word(word) for word in words]
+
+
+def run_benchmark(words, strategy="entropy", processes=None):
+    """
+    Plays every word of the dictionary on a process pool.
+
+    :param words: list of words.
+    :param strategy: str, a key of STRATEGIES.
+    :param processes: int, the number of worker processes (all CPUs by default).
+    :return: list of play_word results, in the order of the words.
+    """
+    chunks = [words[i:i + CHUNK_SIZE] for i in range(0, len(words), CHUNK_SIZE)]
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(words, strategy)) as executor:
+        results = []
+        for chunk_results in executor.map(_play_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def print_report(results):
+    """
+    Prints the win rate, average attempts used and solve times.
+
+    :param results: list of play_word results.
+    """
+    times = [result[4] for result in results]
+    print(f"Games played: {len(results)}")
+    print(f"Win rate: {sum(result[1] for result in results) / len(results):.2%}")
+    print(f"Average attempts used: {statistics.mean(result[2] for result in results):.3f}")
+    print(f"Average letters guessed: {statistics.mean(result[3] for result in results):.3f}")
+    print(f"Solve time per word: mean {statistics.mean(times) * 1000:.3f} ms, "
+          f"median {statistics.median(times) * 1000:.3f} ms, max {max(times) * 1000:.3f} ms")
+
+
+def write_results(file_name, results):
+    """
+    Writes the result of every word to a CSV file.
+
+    :param file_name: str, file name
+    :param results: list of play_word results.
+    """
+    with open(file_name, "w") as file:
+        file.write("word,won,attempts_used,letters_guessed,seconds\n")
+        for word, won, attempts_used, guesses, seconds in results:
+            file.write(f"{word},{int(won)},{attempts_used},{guesses},{seconds:.6f}\n")
+
+
+def main():
+    """Runs the benchmark from the command line:
+    python benchmark.py <dictionary file> [strategy] [processes] [results.csv]"""
+    if not 2 <= len(sys.argv) <= 5 or (len(sys.argv) > 2 and sys.argv[2] not in STRATEGIES):
+        print(f"Usage: python benchmark.py <dictionary file> [{'|'.join(STRATEGIES)}] [processes] [results.csv]")
+        return
+
+    words = list(hangman.load_words(sys.argv[1]))
+    strategy = sys.argv[2] if len(sys.argv) > 2 else "entropy"
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+    start = time.perf_counter()
+    results = run_benchmark(words, strategy, processes)
+    print(f"Strategy: {strategy}, {processes} processes, {time.perf_counter() - start:.1f} s in total")
+    print_report(results)
+    if len(sys.argv) > 4:
+        write_results(sys.argv[4], results)
+
+
+if __name__ == "__main__":
+    main()
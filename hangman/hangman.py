@@ -1,106 +1,241 @@
 """project Hangman"""
 
+import copy
 import random
 
+import solver
+import word_store
 
-def choose_word():
+WORDS = ['python', 'java', 'javascript', 'php']
+ATTEMPTS = 8
+
+
+def choose_word(words=WORDS):
     """
     Chooses a word from the list "words".
     Returns:random word from the list.
     """
-    words = ['python', 'java', 'javascript', 'php']
     return random.choice(words)
 
 
-def display_word(word, guessed_letters):
+def load_words(file_name):
     """
-    Creates an empty string to show guessed letters or -s
+    Loads the words to play with.
     Parameters:
-    word: is the word randomly chosen from the word list;
-    guessed_letters: is the list of guessed letters from the word
+    file_name: a word store built by word_store.py (ends with ".words"), a dictionary
+    with one word per line, or an empty string for the built-in words
     Returns:
-    display string that contains guessed letters from the list or -s
+    a list of words or a WordStore, both work with choose_word
     """
-    display = ''
-    for letter in word:
-        if letter in guessed_letters:
-            display += letter
-        else:
-            display += '-'
-    return display
+    if not file_name:
+        return WORDS
+    if file_name.endswith(word_store.STORE_SUFFIX):
+        return word_store.WordStore(file_name)
+    return solver.load_dictionary(file_name)
+
+
+class HangmanState:
+    """
+    The state of one game. Positions of every letter of the word are found once,
+    so a guess only touches the places where the letter appears.
+
+    word: the word to guess;
+    attempts: how many wrong guesses are left;
+    mask: bytearray with guessed letters or -s, as shown by display();
+    remaining: how many letters of the word are still hidden;
+    guessed: the guessed letters as a 26-bit set (bit 0 is "a", bit 25 is "z").
+    """
+    def __init__(self, word, attempts=ATTEMPTS):
+        self.word = word
+        self.attempts = attempts
+        self.positions = {}
+        for position, letter in enumerate(word):
+            self.positions.setdefault(letter, []).append(position)
+        self.mask = bytearray(b'-' * len(word))
+        self.remaining = len(word)
+        self.guessed = 0
+
+    def copy(self):
+        """
+        Returns:
+        a new state with its own mask, the letter positions are shared since they never change
+        """
+        new_state = copy.copy(self)
+        new_state.mask = bytearray(self.mask)
+        return new_state
+
+    def is_guessed(self, letter):
+        """
+        Checks if the letter was already tried.
+        Parameters:
+        letter: a single English letter in lower case
+        Returns:
+        True or False
+        """
+        return bool(self.guessed >> (ord(letter) - ord('a')) & 1)
+
+    def guess(self, letter):
+        """
+        Applies a new guess: opens the letter in the mask or takes an attempt away.
+        Parameters:
+        letter: a single English letter in lower case that wasn't guessed before
+        Returns:
+        the number of opened positions, 0 if the letter isn't in the word
+        """
+        self.guessed |= 1 << (ord(letter) - ord('a'))
+        positions = self.positions.get(letter, [])
+        for position in positions:
+            self.mask[position] = ord(letter)
+        self.remaining -= len(positions)
+        if not positions:
+            self.attempts -= 1
+        return len(positions)
+
+    def display(self):
+        """
+        Returns:
+        display string that contains guessed letters or -s
+        """
+        return self.mask.decode('ascii')
+
+    def is_won(self):
+        """
+        Returns:
+        True if every letter of the word is opened
+        """
+        return self.remaining == 0
+
+
+def step(state, guess):
+    """
+    One move of the game without any input or printing, so it can be driven by a program.
+    The given state isn't changed.
+    Parameters:
+    state: HangmanState before the move
+    guess: str typed by the player
+    Returns:
+    tuple with the new state and the outcome: "wrong length", "not a letter",
+    "already guessed" (the state stays the same), "miss" or "hit"
+    """
+    guess = guess.lower()
+    if len(guess) != 1:
+        return state, "wrong length"
+    if not (guess.isalpha() and guess.isascii()):
+        return state, "not a letter"
+    if state.is_guessed(guess):
+        return state, "already guessed"
 
+    new_state = state.copy()
+    if new_state.guess(guess) == 0:
+        return new_state, "miss"
+    return new_state, "hit"
 
-def hangman():
+
+def hangman(words=WORDS):
     """
     The main gameplay function. A player tries to guess letters
     from the randomly chosen word in list.
 
-    word_to_guess is the randomly chosen word they have to guess.
-    guessed_letters is the list of guessed letters.
-    attempts is the general amount of their attempts. Isn't affected
-    by errors related to the wrong letter case or symbols that aren't letters.
+    words is the list (or word store) the word is chosen from.
+    state is the HangmanState of the randomly chosen word they have to guess:
+    it keeps the guessed letters and the general amount of their attempts.
+    Attempts aren't affected by errors related to the wrong letter case
+    or symbols that aren't letters.
 
     Returns nothing.
     """
-    word_to_guess = choose_word()
-    guessed_letters = []
-    attempts = 8
+    state = HangmanState(choose_word(words))
 
     print("HANGMAN")
-    print(display_word(word_to_guess, guessed_letters))
+    print(state.display())
 
-    while attempts > 0:
-        guess = input("Input your letter!>").lower()
+    while state.attempts > 0:
+        state, outcome = step(state, input("Input your letter!>"))
 
-        if len(guess) != 1:
+        if outcome == "wrong length":
             print("No, something's wrong. You should try just a single letter!")
             continue
-
-        if not guess.isalpha():
+        elif outcome == "not a letter":
             print("Just English *letters* will do!")
             continue
-
-        if guess in guessed_letters:
+        elif outcome == "already guessed":
             print("You've already guessed this letter, try another one!")
             continue
-
-        guessed_letters.append(guess)
-
-        if guess not in word_to_guess:
+        elif outcome == "miss":
             print("That letter doesn't appear in the word!")
-            attempts -= 1
         else:
             print("Done!")
 
-        current_display = display_word(word_to_guess, guessed_letters)
-        print(current_display)
+        print(state.display())
 
-        if '-' not in current_display:
-            if attempts > 1:
+        if state.is_won():
+            if state.attempts > 1:
                 print("Congrats! you won!")
             else:
                 print("Whew, that was your last attempt, but you won!")
             break
 
-        if attempts == 0:
-            print(f"Sorry, you lost. It was {word_to_guess}. Good luck next time!")
+        if state.attempts == 0:
+            print(f"Sorry, you lost. It was {state.word}. Good luck next time!")
             break
 
 
+def solver_game(index, word_to_guess):
+    """
+    The solver mode. The computer tries to guess the word using the same rules as the player:
+    8 attempts, one letter at a time.
+    Parameters:
+    index: solver.WordIndex of the dictionary;
+    word_to_guess: the hidden word
+    Returns:
+    True if the computer guessed the word
+    """
+    computer = solver.HangmanSolver(index, len(word_to_guess))
+    state = HangmanState(word_to_guess)
+
+    print(state.display())
+    while state.attempts > 0:
+        guess = computer.next_guess()
+        opened = state.guess(guess)
+        current_display = state.display()
+        computer.update(guess, current_display)
+
+        if opened == 0:
+            print(f"{guess}: that letter doesn't appear in the word!")
+        else:
+            print(f"{guess}: done!")
+        print(current_display)
+
+        if state.is_won():
+            print("The computer guessed the word!")
+            return True
+
+    print(f"The computer lost. It was {word_to_guess}.")
+    return False
+
+
 def main_menu():
     """
-    This function creates a simple menu for a player to choose between playing or exiting.
+    This function creates a simple menu for a player to choose between playing, watching the solver or exiting.
     """
     while True:
-        choice = input('Type "play" to play the game, "exit" to quit: ').lower()
+        choice = input('Type "play" to play the game, "solve" to watch the computer guess, "exit" to quit: ').lower()
 
-        if choice == 'play':
-            hangman()
+        if choice in ['play', 'solve']:
+            file_name = input("Enter the dictionary file (leave empty for the built-in words)>").strip()
+            words = load_words(file_name)
+            if choice == 'play':
+                hangman(words)
+            else:
+                word_to_guess = choose_word(words)
+                if isinstance(words, word_store.WordStore):
+                    words = words.words(length=len(word_to_guess))
+                solver_game(solver.WordIndex(words), word_to_guess)
         elif choice == 'exit':
             print("Okay, see you!")
             break
         else:
-            print("Wrong choice! Just 'play' or 'exit'")
+            print("Wrong choice! Just 'play', 'solve' or 'exit'")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+"""Hangman solver"""
+
+import math
+import string
+
+
+def load_dictionary(file_name):
+    """
+    Reads a dictionary file with one word per line.
+    Only words made of English letters are kept, in lower case and without repeats.
+
+    :param file_name: str, file name
+    :return: list of words.
+    """
+    words = {}
+    with open(file_name, "r") as file:
+        for line in file:
+            word = line.strip().lower()
+            if word.isalpha() and word.isascii():
+                words[word] = None
+    return list(words)
+
+
+def _bitset(word_ids, size):
+    """
+    Builds a bitset (an int where bit i stands for word i) out of a list of word ids.
+    Goes through a bytearray, because setting bits of a big int one by one copies it every time.
+
+    :param word_ids: list of int
+    :param size: int, number of words in the group
+    :return: int
+    """
+    bits = bytearray((size + 7) // 8)
+    for word_id in word_ids:
+        bits[word_id >> 3] |= 1 << (word_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+class WordIndex:
+    """This class indexes the dictionary for the solver. Words are grouped by length, and inside every group
+    the word ids are indexed by the letters on each position and by the letters they contain,
+    all as bitsets over the word ids."""
+    def __init__(self, words):
+        """Initialization of the index.
+        :arg: words (iterable): dictionary words in lower case."""
+        self.words_by_length = {}
+        for word in words:
+            self.words_by_length.setdefault(len(word), []).append(word)
+
+        self.position_bits = {}
+        self.letter_bits = {}
+        # The first guess only depends on the word length, so it's counted once per length.
+        self.first_guesses = {}
+        for length, group in self.words_by_length.items():
+            at_position = [{} for _ in range(length)]
+            containing = {}
+            for word_id, word in enumerate(group):
+                for position, letter in enumerate(word):
+                    at_position[position].setdefault(letter, []).append(word_id)
+                for letter in set(word):
+                    containing.setdefault(letter, []).append(word_id)
+            size = len(group)
+            self.position_bits[length] = [
+                {letter: _bitset(ids, size) for letter, ids in letters.items()} for letters in at_position
+            ]
+            self.letter_bits[length] = {letter: _bitset(ids, size) for letter, ids in containing.items()}
+
+    def all_words(self, length):
+        """Gives the bitset with every word of the given length.
+        :arg: length (int): word length.
+        :returns: int bitset."""
+        return (1 << len(self.words_by_length.get(length, []))) - 1
+
+    def words(self, length, candidates):
+        """Turns a bitset back into words.
+        :arg: length (int): word length.
+        :arg: candidates (int): bitset of word ids.
+        :returns: list of words."""
+        group = self.words_by_length.get(length, [])
+        bits = bin(candidates)[:1:-1]
+        return [group[word_id] for word_id, bit in enumerate(bits) if bit == "1"]
+
+
+class HangmanSolver:
+    """This class guesses the letters of a word of a known length. It keeps the still possible words as
+    a bitset, narrows it with bitwise ANDs after every answer and picks the letter that gives the
+    most expected information about the word."""
+    def __init__(self, index, length):
+        """Initialization of the solver for one word.
+        :arg: index (WordIndex): indexed dictionary.
+        :arg: length (int): length of the hidden word."""
+        self.index = index
+        self.length = length
+        self.candidates = index.all_words(length)
+        self.guessed_letters = []
+        self._position_bits = index.position_bits.get(length, [{} for _ in range(length)])
+        self._letter_bits = index.letter_bits.get(length, {})
+
+    def update(self, letter, display):
+        """Narrows the candidates after a guess.
+        :arg: letter (str): the guessed letter.
+        :arg: display (str): the word as shown by HangmanState.display after the guess (guessed letters or -s).
+        :returns: none"""
+        self.guessed_letters.append(letter)
+        for position in range(self.length):
+            letter_here = self._position_bits[position].get(letter, 0)
+            if display[position] == letter:
+                self.candidates &= letter_here
+            else:
+                self.candidates &= ~letter_here
+
+    def _information_gain(self, letter):
+        """Counts the expected information (entropy in bits) of guessing a letter. The candidates are split
+        into groups by the positions where the letter would appear, one position at a time.
+        :arg: letter (str): the letter to check.
+        :returns: float"""
+        total = self.candidates.bit_count()
+        hits = self.candidates & self._letter_bits.get(letter, 0)
+        groups = [hits] if hits else []
+        for position in range(self.length):
+            letter_here = self._position_bits[position].get(letter, 0)
+            if not letter_here & hits:
+                continue
+            split = []
+            for group in groups:
+                for part in (group & letter_here, group & ~letter_here):
+                    if part:
+                        split.append(part)
+            groups = split
+        sizes = [group.bit_count() for group in groups]
+        if total > hits.bit_count():
+            sizes.append(total - hits.bit_count())
+
+        entropy = 0.0
+        for size in sizes:
+            probability = size / total
+            entropy -= probability * math.log2(probability)
+        return entropy
+
+    def next_guess(self):
+        """Picks the next letter. Among the letters with the same information gain the one that appears
+        in more candidates wins, so the solver doesn't waste attempts.
+        :returns: str, the letter to guess."""
+        if not self.guessed_letters:
+            if self.length not in self.index.first_guesses:
+                self.index.first_guesses[self.length] = self._best_letter()
+            return self.index.first_guesses[self.length]
+        return self._best_letter()
+
+    def _best_letter(self):
+        """Counts the information gain of every letter that wasn't guessed yet.
+        :returns: str, the best letter."""
+        letters = [letter for letter in string.ascii_lowercase if letter not in self.guessed_letters]
+        if not self.candidates:
+            # The word isn't in the dictionary, fall back to the most common letters of the same length.
+            return max(letters, key=lambda letter: self._letter_bits.get(letter, 0).bit_count())
+
+        return max(letters, key=lambda letter: (
+            self._information_gain(letter),
+            (self.candidates & self._letter_bits.get(letter, 0)).bit_count()
+        ))
+
+    def remaining_words(self):
+        """Lists the words that are still possible.
+        :returns: list of words."""
+        return self.index.words(self.length, self.candidates)
+
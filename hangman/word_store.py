@@ -0,0 +1,160 @@
+"""Indexed word store for Hangman"""
+
+import mmap
+import random
+import sys
+from array import array
+
+STORE_SUFFIX = ".words"
+INDEX_SUFFIX = ".idx"
+DIFFICULTIES = {1: "easy", 2: "medium", 3: "hard"}
+
+
+def _difficulty_scores(words):
+    """
+    Scores every word by how common its letters are in the dictionary:
+    the average frequency of its distinct letters. Words made of common letters are easier to guess.
+
+    :param words: list of words.
+    :return: list of float, one score per word.
+    """
+    letter_counts = {}
+    for word in words:
+        for letter in word:
+            letter_counts[letter] = letter_counts.get(letter, 0) + 1
+    total = sum(letter_counts.values())
+    scores = []
+    for word in words:
+        letters = set(word)
+        scores.append(sum(letter_counts[letter] for letter in letters) / total / len(letters))
+    return scores
+
+
+def build_store(dictionary_file, store_file):
+    """
+    The build step. Reads a dictionary with one word per line and writes two files:
+    the words sorted by length, difficulty and then alphabetically, one per line, and next to it
+    the index (store_file + ".idx"), an array of unsigned 64-bit numbers:
+    the number of buckets, the number of words, then (length, difficulty, first id, end id) for every bucket,
+    then the byte offset of every word plus the end of the file.
+
+    :param dictionary_file: str, file name of the dictionary.
+    :param store_file: str, file name for the sorted words.
+    :return: int, the number of words stored.
+    :raises ValueError: if the dictionary has no words to store, an empty store can't be opened.
+    """
+    words = {}
+    with open(dictionary_file, "r") as file:
+        for line in file:
+            word = line.strip().lower()
+            if word.isalpha() and word.isascii():
+                words[word] = None
+    words = list(words)
+    if not words:
+        raise ValueError(f"{dictionary_file} has no words made of English letters.")
+
+    # Splits the scores into thirds: the most common letters are easy, the rarest ones are hard.
+    scores = _difficulty_scores(words)
+    ordered = sorted(scores, reverse=True)
+    easy_limit = ordered[len(ordered) // 3] if ordered else 0
+    medium_limit = ordered[2 * len(ordered) // 3] if ordered else 0
+    entries = []
+    for word, score in zip(words, scores):
+        difficulty = 1 if score > easy_limit else 2 if score > medium_limit else 3
+        entries.append((len(word), difficulty, word))
+    entries.sort()
+
+    buckets = []
+    offsets = array("Q")
+    offset = 0
+    with open(store_file, "wb") as file:
+        for word_id, (length, difficulty, word) in enumerate(entries):
+            if not buckets or buckets[-1][:2] != [length, difficulty]:
+                buckets.append([length, difficulty, word_id, word_id])
+            buckets[-1][3] = word_id + 1
+            offsets.append(offset)
+            data = word.encode("ascii") + b"\n"
+            file.write(data)
+            offset += len(data)
+    offsets.append(offset)
+
+    index = array("Q", [len(buckets), len(entries)])
+    for bucket in buckets:
+        index.extend(bucket)
+    index.extend(offsets)
+    with open(store_file + INDEX_SUFFIX, "wb") as file:
+        index.tofile(file)
+    return len(entries)
+
+
+class WordStore:
+    """This class reads words from a built store without loading it: both files are memory-mapped,
+    and only the small bucket table is parsed when the store is opened. It can be used like a read-only
+    list of words, so random.choice works on it directly."""
+    def __init__(self, store_file):
+        """Initialization of the store.
+        :arg: store_file (str): file name of the sorted words, the index is expected next to it."""
+        with open(store_file, "rb") as file:
+            self._words = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(store_file + INDEX_SUFFIX, "rb") as file:
+            self._index_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        index = memoryview(self._index_map).cast("Q")
+
+        bucket_count, self._size = index[0], index[1]
+        self.buckets = [tuple(index[2 + 4 * i: 6 + 4 * i]) for i in range(bucket_count)]
+        self._offsets = index[2 + 4 * bucket_count:]
+
+    def __len__(self):
+        """The number of words in the store."""
+        return self._size
+
+    def __getitem__(self, word_id):
+        """Reads one word by its id, without touching the rest of the file.
+        :arg: word_id (int): from 0 to len(store) - 1.
+        :returns: str, the word."""
+        if not 0 <= word_id < self._size:
+            raise IndexError("word id out of range")
+        return self._words[self._offsets[word_id]:self._offsets[word_id + 1] - 1].decode("ascii")
+
+    def _matching_buckets(self, length=None, difficulty=None):
+        """Finds the buckets of words with the given length and difficulty (None means any).
+        :returns: list of (first id, end id)."""
+        return [(start, end) for bucket_length, bucket_difficulty, start, end in self.buckets
+                if (length is None or bucket_length == length)
+                and (difficulty is None or bucket_difficulty == difficulty)]
+
+    def count(self, length=None, difficulty=None):
+        """Counts the words with the given length and difficulty.
+        :returns: int"""
+        return sum(end - start for start, end in self._matching_buckets(length, difficulty))
+
+    def random_word(self, length=None, difficulty=None):
+        """Picks a random word with the given length and difficulty (1 - easy, 2 - medium, 3 - hard).
+        Every matching word has the same chance, and only the bucket table is scanned.
+        :returns: str, the word, or None if no word matches."""
+        buckets = self._matching_buckets(length, difficulty)
+        position = random.randrange(sum(end - start for start, end in buckets)) if buckets else 0
+        for start, end in buckets:
+            if position < end - start:
+                return self[start + position]
+            position -= end - start
+        return None
+
+    def words(self, length=None, difficulty=None):
+        """Goes through the words with the given length and difficulty.
+        :returns: generator of str."""
+        for start, end in self._matching_buckets(length, difficulty):
+            for word_id in range(start, end):
+                yield self[word_id]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: python word_store.py <dictionary file> <store file{STORE_SUFFIX}>")
+    else:
+        try:
+            stored = build_store(sys.argv[1], sys.argv[2])
+        except ValueError as error:
+            print(error)
+        else:
+            print(f"Stored {stored} words in {sys.argv[2]}")
@@ -0,0 +1,115 @@
+"""Take-away game solver for the pencils game"""
+import random
+
+
+class TakeAwayGame:
+    """A take-away game: players take turns removing a number of pencils from the allowed moves
+    out of one pile. The game ends when the player to move can't take anything.
+    In misère play (the pencils game) the player who took the last pencils loses,
+    in normal play they win.
+
+    The values of the pile sizes are kept in a table that is memoized and extended only when needed.
+    A value only depends on the previous max(moves) values, so once a window of them repeats,
+    the table is periodic and any pile size, like 10**9, is answered in O(1).
+
+    Normal play values are Grundy numbers, so several piles are combined with XOR.
+    Misère values are just wins (1) and losses (0); several piles in misère play are solved
+    by a memoized search over all positions, which only works for small piles."""
+
+    def __init__(self, moves=(1, 2, 3), misere=True):
+        """Initialization of the game.
+        moves: the numbers of pencils that can be taken in one turn.
+        misere: True if the player who takes the last pencils loses."""
+        self.moves = sorted(set(moves))
+        if not self.moves or self.moves[0] <= 0:
+            raise ValueError("Moves should be positive numbers.")
+        self.misere = misere
+        self.values = []
+        self.period_start = None
+        self.period = None
+        self._windows = {}
+        self._positions = {}
+
+    def _extend(self, size):
+        """Computes the values of pile sizes up to size, stops as soon as a period is found."""
+        window_size = self.moves[-1]
+        while self.period is None and len(self.values) <= size:
+            n = len(self.values)
+            options = [self.values[n - move] for move in self.moves if move <= n]
+            if self.misere:
+                # With no moves the player to move wins; otherwise they win if they can leave a loss.
+                value = 1 if not options or 0 in options else 0
+            else:
+                value = 0
+                while value in options:
+                    value += 1
+            self.values.append(value)
+
+            if n + 1 >= window_size:
+                window = tuple(self.values[n + 1 - window_size:])
+                if window in self._windows:
+                    self.period_start = self._windows[window] + 1 - window_size
+                    self.period = n + 1 - (self.period_start + window_size)
+                else:
+                    self._windows[window] = n
+
+    def value(self, pencils):
+        """Returns: the Grundy number of a pile in normal play, or 1 (win) / 0 (loss)
+        for the player to move in misère play."""
+        self._extend(pencils)
+        if self.period is not None and pencils >= len(self.values):
+            pencils = self.period_start + (pencils - self.period_start) % self.period
+        return self.values[pencils]
+
+    def legal_moves(self, piles):
+        """Returns: list of (pile index, pencils to take)."""
+        return [(i, move) for i, pile in enumerate(piles) for move in self.moves if move <= pile]
+
+    def is_winning(self, piles):
+        """Returns: True if the player to move wins with perfect play."""
+        if len(piles) == 1:
+            return self.value(piles[0]) != 0
+        if not self.misere:
+            total = 0
+            for pile in piles:
+                total ^= self.value(pile)
+            return total != 0
+        return self._misere_winning(tuple(sorted(pile for pile in piles if pile >= self.moves[0])))
+
+    def _misere_winning(self, piles):
+        """Memoized search for several piles in misère play."""
+        if piles not in self._positions:
+            winning = True
+            for i, move in self.legal_moves(piles):
+                winning = False
+                after = list(piles)
+                after[i] -= move
+                if not self._misere_winning(tuple(sorted(pile for pile in after if pile >= self.moves[0]))):
+                    winning = True
+                    break
+            self._positions[piles] = winning
+        return self._positions[piles]
+
+    def best_move(self, piles, rng=random):
+        """Chooses a move for the player. A winning move if there is one,
+        a random legal move otherwise.
+        Returns: tuple (pile index, pencils to take), or None if there are no legal moves."""
+        moves = self.legal_moves(piles)
+        if not moves:
+            return None
+        if not self.misere and len(piles) > 1:
+            total = 0
+            for pile in piles:
+                total ^= self.value(pile)
+            if total:
+                for i, move in moves:
+                    if self.value(piles[i] - move) == total ^ self.value(piles[i]):
+                        return i, move
+            return rng.choice(moves)
+
+        for i, move in moves:
+            after = list(piles)
+            after[i] -= move
+            if not self.is_winning(after):
+                return i, move
+        return rng.choice(moves)
@@ -1,13 +1,47 @@
 """project pencils game"""
 import random
 
+from grundy import TakeAwayGame
+from render import PileWriter
 
-def main():
+
+def johnny(game, pencils, rng=random):
+    """Johnny the bot's strategy: the perfect move from the solver,
+    or a random one if every move loses.
+    Returns: the number of pencils to take."""
+    return game.best_move([pencils], rng)[1]
+
+
+def play_game(game, pencils, players, rng=random):
+    """The pure game engine: plays a whole game between two strategies without input or printing.
+    players: two functions (game, pencils, rng) -> the number of pencils to take,
+    the first one moves first.
+    Returns: tuple: the index of the winner (0 or 1), the number of moves."""
+    current = 0
+    moves = 0
+    while game.legal_moves([pencils]):
+        taken = players[current](game, pencils, rng)
+        if taken not in game.moves or taken > pencils:
+            raise ValueError(f"Player {current} tried to take {taken} of {pencils} pencils")
+        pencils -= taken
+        moves += 1
+        current = 1 - current
+    # The current player can't move: they win in misère play and lose in normal play.
+    return (current if game.misere else 1 - current), moves
+
+
+def main(moves=(1, 2, 3), misere=True):
     """The main game cycle.
     The user plays against Johnny the bot.
     In the beginning, the user decides who goes first (user or Johnny).
-    They both take turns drawing pencils from the selected amount until there are no pencils left.
-    The player who draws the last pencil loses."""
+    They both take turns drawing pencils (as many as one of the moves allows) from the selected amount
+    until no move is possible. In misère play (the default) the player who draws the last pencil loses,
+    in normal play they win. Johnny plays perfectly with the TakeAwayGame solver.
+    Big piles are drawn in a compact form, see render_pile."""
+    game = TakeAwayGame(moves, misere)
+    allowed = [str(move) for move in game.moves]
+    quoted = [f"'{move}'" for move in allowed]
+    possible_values = ", ".join(quoted[:-1]) + " or " + quoted[-1] if len(quoted) > 1 else quoted[0]
 
     player_name = input("What's your name? >")
     while True:
@@ -27,43 +61,33 @@ def main():
         else:
             break
 
-    current_player = first_player
-
-    while pencils > 0:
-        print(f"{current_player}'s turn!")
-        print("|" * pencils)
-        if current_player == 'Johnny':
-            if pencils % 4 == 0:
-                taken_pencils = 3
-            elif pencils % 4 == 3:
-                taken_pencils = 2
-            elif pencils % 4 == 1:
-                taken_pencils = 1
+    writer = PileWriter()
+
+    def johnny_turn(game, pencils, rng):
+        writer.line("Johnny's turn!")
+        writer.pile(pencils)
+        taken_pencils = johnny(game, pencils, rng)
+        writer.line(str(taken_pencils))
+        return taken_pencils
+
+    def user_turn(game, pencils, rng):
+        writer.line(f"{player_name}'s turn!")
+        writer.pile(pencils)
+        writer.flush()
+        while True:
+            taken_pencils = input("> ")
+            if taken_pencils not in allowed:
+                print(f"Possible values: {possible_values}")
+            elif int(taken_pencils) > pencils:
+                print("Too many pencils were taken")
             else:
-                taken_pencils = random.randint(1, min(pencils, 3))
-            print(taken_pencils)
-        else:
-            while True:
-                taken_pencils = input("> ")
-                if taken_pencils not in ['1', '2', '3']:
-                    print("Possible values: '1', '2' or '3'")
-                elif int(taken_pencils) > pencils:
-                    print("Too many pencils were taken")
-                else:
-                    break
-
-        pencils -= int(taken_pencils)
-
-        if current_player == player_name:
-            current_player = "Johnny"
-        else:
-            current_player = player_name
+                return int(taken_pencils)
 
-    if current_player == "Johnny":
-        winner = "Johnny"
-    else:
-        winner = player_name
-    print(f"{winner} won! ;)")
+    names = [first_player, player_name if first_player == "Johnny" else "Johnny"]
+    players = [johnny_turn if name == "Johnny" else user_turn for name in names]
+    winner, _ = play_game(game, pencils, players)
+    writer.line(f"{names[winner]} won! ;)")
+    writer.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+"""Rendering of the pencils for the pencils game"""
+import sys
+
+WIDTH = 80
+MAX_BUCKET = 1000
+FLUSH_LINES = 64
+
+
+def render_pile(pencils, width=WIDTH):
+    """Draws a pile so the line is never longer than about the width, whatever the size of the pile:
+    full: every pencil, like "|||||", if they fit in the width;
+    bucketed: a bar of buckets of 10, 100 or 1000 pencils and the rest, like "||||||| ×100 + 34";
+    run-length: "|×N" for bigger piles.
+    Returns: str."""
+    if pencils <= width:
+        return "|" * pencils
+    bucket = 10
+    while pencils // bucket > width and bucket < MAX_BUCKET:
+        bucket *= 10
+    buckets, rest = divmod(pencils, bucket)
+    if buckets > width:
+        return f"|×{pencils}"
+    return f"{'|' * buckets} ×{bucket} + {rest}" if rest else f"{'|' * buckets} ×{bucket}"
+
+
+class PileWriter:
+    """This class collects the lines of the game and writes them to the output in one call
+    every FLUSH_LINES lines, or before the game waits for input, so a turn costs
+    a constant amount of output however big the pile is."""
+    def __init__(self, output=None, width=WIDTH):
+        """Initialization of the writer.
+        output: a file to write to, the standard output by default.
+        width: the width of a pile line."""
+        self.output = output or sys.stdout
+        self.width = width
+        self._lines = []
+
+    def line(self, text):
+        """Adds a line of text."""
+        self._lines.append(text)
+        if len(self._lines) >= FLUSH_LINES:
+            self.flush()
+
+    def pile(self, pencils):
+        """Adds the drawing of a pile."""
+        self.line(render_pile(pencils, self.width))
+
+    def flush(self):
+        """Writes the lines collected so far."""
+        if self._lines:
+            self._lines.append("")
+            self.output.write("\n".join(self._lines))
+            self._lines = []
+        self.output.flush()
@@ -0,0 +1,167 @@
+"""Headless tournament of pencils game bots"""
+
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from grundy import TakeAwayGame
+from pencils_game import johnny, play_game
+
+MAX_PENCILS = 1000
+CHUNK_SIZE = 10000
+
+
+def random_move(game, pencils, rng):
+    """Takes a random allowed number of pencils."""
+    return rng.choice([move for move in game.moves if move <= pencils])
+
+
+def greedy_move(game, pencils, rng):
+    """Always takes as many pencils as it can."""
+    return max(move for move in game.moves if move <= pencils)
+
+
+def cautious_move(game, pencils, rng):
+    """Always takes as few pencils as it can."""
+    return game.moves[0]
+
+
+STRATEGIES = {
+    "johnny": johnny,
+    "random": random_move,
+    "greedy": greedy_move,
+    "cautious": cautious_move,
+}
+
+# Every worker process builds its own solver once, in _init_worker.
+_game = None
+
+
+def _init_worker(moves, misere):
+    """
+    Prepares a worker process: creates the game, so the solver table is memoized once per worker.
+
+    :param moves: the numbers of pencils that can be taken in one turn.
+    :param misere: True if the player who takes the last pencils loses.
+    """
+    global _game
+    _game = TakeAwayGame(moves, misere)
+
+
+def _timed(strategy, stats):
+    """
+    Wraps a strategy to count its decisions and the time they take.
+
+    :param strategy: function (game, pencils, rng) -> the number of pencils to take.
+    :param stats: list [decisions, nanoseconds] to add to.
+    :return: the wrapped function.
+    """
+    def decide(game, pencils, rng):
+        start = time.perf_counter_ns()
+        taken = strategy(game, pencils, rng)
+        stats[1] += time.perf_counter_ns() - start
+        stats[0] += 1
+        return taken
+    return decide
+
+
+def _play_chunk(task):
+    """
+    Plays a chunk of games of one pairing in a worker. The start sizes are random,
+    and the bots take turns to move first.
+
+    :param task: tuple (first strategy, second strategy, number of games, max pencils, seed).
+    :return: tuple: (first strategy, second strategy, wins of the first, games,
+    {strategy: [decisions, nanoseconds]}).
+    """
+    first, second, games, max_pencils, seed = task
+    rng = random.Random(seed)
+    stats = {first: [0, 0], second: [0, 0]}
+    bots = [_timed(STRATEGIES[first], stats[first]), _timed(STRATEGIES[second], stats[second])]
+    wins = 0
+    for i in range(games):
+        pencils = rng.randint(1, max_pencils)
+        if i % 2:
+            winner, _ = play_game(_game, pencils, bots[::-1], rng)
+            wins += winner == 1
+        else:
+            winner, _ = play_game(_game, pencils, bots, rng)
+            wins += winner == 0
+    return first, second, wins, games, stats
+
+
+def run_tournament(strategies, games, max_pencils=MAX_PENCILS, moves=(1, 2, 3), misere=True,
+                   processes=None, seed=0):
+    """
+    Plays every pair of strategies against each other on a process pool.
+
+    :param strategies: list of keys of STRATEGIES.
+    :param games: int, the number of games for every pair.
+    :param max_pencils: int, the start sizes are random from 1 to max_pencils.
+    :param moves: the numbers of pencils that can be taken in one turn.
+    :param misere: True if the player who takes the last pencils loses.
+    :param processes: int, the number of worker processes (all CPUs by default).
+    :param seed: int, the seed of the random start sizes and moves.
+    :return: tuple: ({(first, second): (wins of the first, games)}, {strategy: [decisions, nanoseconds]}).
+    """
+    tasks = []
+    for first, second in itertools.combinations(strategies, 2):
+        for start in range(0, games, CHUNK_SIZE):
+            tasks.append((first, second, min(CHUNK_SIZE, games - start), max_pencils, seed + len(tasks)))
+
+    pairs = {}
+    latency = {strategy: [0, 0] for strategy in strategies}
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(moves, misere)) as executor:
+        for first, second, wins, played, stats in executor.map(_play_chunk, tasks):
+            total_wins, total_games = pairs.get((first, second), (0, 0))
+            pairs[first, second] = (total_wins + wins, total_games + played)
+            for strategy, (decisions, nanoseconds) in stats.items():
+                latency[strategy][0] += decisions
+                latency[strategy][1] += nanoseconds
+    return pairs, latency
+
+
+def print_report(pairs, latency):
+    """
+    Prints the win rate of every pairing, the overall win rates and the decision latency.
+
+    :param pairs: {(first, second): (wins of the first, games)} from run_tournament.
+    :param latency: {strategy: [decisions, nanoseconds]} from run_tournament.
+    """
+    overall = {strategy: [0, 0] for strategy in latency}
+    for (first, second), (wins, games) in pairs.items():
+        print(f"{first} vs {second}: {first} wins {wins / games:.2%} of {games} games")
+        overall[first][0] += wins
+        overall[second][0] += games - wins
+        overall[first][1] += games
+        overall[second][1] += games
+
+    print(f"{'strategy':>10} {'win rate':>9} {'moves':>12} {'ns per move':>12}")
+    for strategy, (wins, games) in sorted(overall.items(), key=lambda item: -item[1][0] / item[1][1]):
+        decisions, nanoseconds = latency[strategy]
+        print(f"{strategy:>10} {wins / games:>9.2%} {decisions:>12} {nanoseconds / decisions:>12.0f}")
+
+
+def main():
+    """Runs the tournament from the command line:
+    python tournament.py [games per pair] [max pencils] [processes]"""
+    if len(sys.argv) > 4 or not all(arg.isdigit() for arg in sys.argv[1:]):
+        print("Usage: python tournament.py [games per pair] [max pencils] [processes]")
+        return
+
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    max_pencils = int(sys.argv[2]) if len(sys.argv) > 2 else MAX_PENCILS
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+    start = time.perf_counter()
+    pairs, latency = run_tournament(list(STRATEGIES), games, max_pencils, processes=processes)
+    print(f"{len(STRATEGIES)} strategies, {games} games per pair, {processes} processes, "
+          f"{time.perf_counter() - start:.1f} s in total")
+    print_report(pairs, latency)
+
+
+if __name__ == "__main__":
+    main()
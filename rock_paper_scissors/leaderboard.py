@@ -0,0 +1,151 @@
+"""Leaderboard for rock paper scissors ratings"""
+
+import heapq
+
+BUCKET_SIZE = 50
+MAX_BUCKET = 1 << 14
+
+
+class Leaderboard:
+    """
+    Ranks the players by their ratings with a Fenwick tree that counts the players in every bucket of scores,
+    so updating a score, the rank and the percentile of a player and every step of the top list are O(log n).
+    Players in the same bucket share a rank; the rounds give 0, 50 or 100 points,
+    so with the default bucket size every bucket is one exact score.
+    The tree grows with the best score, so the buckets stop at MAX_BUCKET: all the higher scores share
+    the top bucket, and one huge rating can't make the tree huge. The top list still orders them exactly.
+    """
+    def __init__(self, ratings=None, bucket_size=BUCKET_SIZE):
+        """
+        :param ratings: dict (usernames for keys, ratings for values) to start with.
+        :param bucket_size: int, how many scores go into one bucket.
+        """
+        self.bucket_size = bucket_size
+        self.scores = {}
+        self._members = {}
+        self._tree = [0] * 2
+        if ratings:
+            # Fill the buckets first and build the tree once, in O(n + buckets).
+            for name, score in ratings.items():
+                self.scores[name] = score
+                self._members.setdefault(self._bucket(score), {})[name] = score
+            self._grow(max(self._members))
+
+    def __len__(self):
+        """
+        :return: int, the number of players.
+        """
+        return len(self.scores)
+
+    def _bucket(self, score):
+        """
+        :param score: int, a rating.
+        :return: int, the bucket of the rating, counted from 1 as the tree needs, at most MAX_BUCKET.
+        """
+        return min(max(score, 0) // self.bucket_size + 1, MAX_BUCKET)
+
+    def _grow(self, bucket):
+        """
+        Doubles the tree until the bucket fits and rebuilds it from the bucket counts in O(size).
+
+        :param bucket: int, the bucket that has to fit.
+        """
+        size = len(self._tree)
+        while size <= bucket:
+            size *= 2
+        tree = [0] * size
+        for member_bucket, members in self._members.items():
+            tree[member_bucket] += len(members)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _add(self, bucket, count):
+        """
+        :param bucket: int, the bucket.
+        :param count: int, how many players to add to it (negative to remove).
+        """
+        tree = self._tree
+        while bucket < len(tree):
+            tree[bucket] += count
+            bucket += bucket & -bucket
+
+    def _count_up_to(self, bucket):
+        """
+        :param bucket: int, the bucket.
+        :return: int, the number of players in the buckets up to this one.
+        """
+        count = 0
+        bucket = min(bucket, len(self._tree) - 1)
+        while bucket > 0:
+            count += self._tree[bucket]
+            bucket -= bucket & -bucket
+        return count
+
+    def _find(self, count):
+        """
+        :param count: int, from 1 to the number of players.
+        :return: int, the lowest bucket with at least count players up to it.
+        """
+        bucket = 0
+        step = 1 << (len(self._tree).bit_length() - 1)
+        while step:
+            if bucket + step < len(self._tree) and self._tree[bucket + step] < count:
+                bucket += step
+                count -= self._tree[bucket]
+            step >>= 1
+        return bucket + 1
+
+    def update(self, name, score):
+        """
+        Sets the rating of a player, adds the player if needed.
+
+        :param name: str, the username.
+        :param score: int, the new rating.
+        """
+        if name in self.scores:
+            old_bucket = self._bucket(self.scores[name])
+            del self._members[old_bucket][name]
+            if not self._members[old_bucket]:
+                del self._members[old_bucket]
+            self._add(old_bucket, -1)
+        bucket = self._bucket(score)
+        if bucket >= len(self._tree):
+            self._grow(bucket)
+        self.scores[name] = score
+        self._members.setdefault(bucket, {})[name] = score
+        self._add(bucket, 1)
+
+    def rank(self, name):
+        """
+        :param name: str, the username.
+        :return: int, 1 for the best players, 1 + the number of players with a better bucket otherwise.
+        """
+        return len(self.scores) - self._count_up_to(self._bucket(self.scores[name])) + 1
+
+    def percentile(self, name):
+        """
+        :param name: str, the username.
+        :return: float, the percentage of the other players who are rated lower, 0 if there are no others.
+        """
+        if len(self.scores) == 1:
+            return 0.0
+        lower = self._count_up_to(self._bucket(self.scores[name]) - 1)
+        return 100 * lower / (len(self.scores) - 1)
+
+    def top(self, k):
+        """
+        :param k: int, how many players to list.
+        :return: list of tuples (name, rating), the best first, names in order within a rating.
+        """
+        result = []
+        remaining = len(self.scores)
+        while remaining and len(result) < k:
+            bucket = self._find(remaining)
+            members = self._members[bucket]
+            best = heapq.nsmallest(k - len(result), members.items(), key=lambda item: (-item[1], item[0]))
+            result.extend(best)
+            remaining -= len(members)
+        return result
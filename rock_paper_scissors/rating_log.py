@@ -0,0 +1,178 @@
+"""Append-only rating log for rock paper scissors"""
+
+import glob
+import os
+import threading
+
+RATINGS_FILE = "rating.txt"
+SYNC_EVERY = 100
+COMPACT_EVERY = 10000
+
+
+def rating_line(name, score):
+    """
+    :param name: str, the username.
+    :param score: int, the rating.
+    :return: str, the "name score" line of the ratings files.
+    """
+    return f"{name} {score}\n"
+
+
+def replay(file_name, ratings):
+    """
+    Reads "name score" lines from a file into the ratings, a later line for a name wins.
+    A last line without the end of line was cut off by a crash and is skipped.
+
+    :param file_name: str, file name
+    :param ratings: dict (usernames for keys, ratings for values) to update.
+    :return: int, the number of lines read.
+    """
+    lines = 0
+    with open(file_name, "r") as file:
+        for line in file:
+            if not line.endswith("\n"):
+                break
+            name, score = line.split()
+            ratings[name] = int(score)
+            lines += 1
+    return lines
+
+
+class RatingLog:
+    """
+    Keeps the ratings as a snapshot file and append-only logs, so a round writes one short line
+    instead of the whole ratings file.
+
+    Every record is the new rating of a player, not the difference, so replaying a log twice changes nothing.
+    The log is synced to the disk every sync_every records. After compact_every records it's put aside
+    and a new one is started, while a background thread folds the old logs into the snapshot.
+
+    Files:
+    rating.txt - the snapshot, "name score" lines, the format the game has always used;
+    rating.txt.<generation>.log - the logs, "name score" lines, replayed in the order of generations.
+    """
+    def __init__(self, file_name=RATINGS_FILE, sync_every=SYNC_EVERY, compact_every=COMPACT_EVERY):
+        """
+        :param file_name: str, the snapshot file name, the logs are next to it.
+        :param sync_every: int, how many records to write between syncs to the disk.
+        :param compact_every: int, how many records to write before the log is compacted.
+        """
+        self.file_name = file_name
+        self.sync_every = sync_every
+        self.compact_every = compact_every
+        self.generation = 0
+        self.records = 0
+        self._unsynced = 0
+        self._log = None
+        self._compaction = None
+
+    def _log_name(self, generation):
+        """
+        :param generation: int, the number of the log.
+        :return: str, the file name of the log.
+        """
+        return f"{self.file_name}.{generation}.log"
+
+    def _generations(self):
+        """
+        :return: list of int, the generations of the logs on the disk, in order.
+        """
+        prefix, suffix = self.file_name + ".", ".log"
+        generations = []
+        for log_name in glob.glob(glob.escape(self.file_name) + ".*.log"):
+            number = log_name[len(prefix):-len(suffix)]
+            if number.isdigit():
+                generations.append(int(number))
+        return sorted(generations)
+
+    def load(self):
+        """
+        Reads the snapshot and replays the logs written after it.
+
+        :return: dict (usernames for keys, ratings for values)
+        """
+        ratings = {}
+        if os.path.exists(self.file_name):
+            replay(self.file_name, ratings)
+        generations = self._generations()
+        self.records = 0
+        for generation in generations:
+            self.records += replay(self._log_name(generation), ratings)
+        self.generation = generations[-1] + 1 if generations else 0
+        return ratings
+
+    def record(self, name, score):
+        """
+        Appends the new rating of a player to the log.
+
+        :param name: str, the username.
+        :param score: int, the new rating.
+        """
+        if self._log is None:
+            self._log = open(self._log_name(self.generation), "a")
+        self._log.write(rating_line(name, score))
+        self.records += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        if self.records >= self.compact_every:
+            self.compact()
+
+    def sync(self):
+        """
+        Writes the records of the current log to the disk.
+        """
+        if self._log is not None:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        self._unsynced = 0
+
+    def compact(self):
+        """
+        Closes the current log, starts a new one and folds the old logs into the snapshot
+        in a background thread. Does nothing if the last compaction is still running.
+        """
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self.sync()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self.generation += 1
+        self.records = 0
+        self._compaction = threading.Thread(target=self._write_snapshot, args=(self.generation,), daemon=True)
+        self._compaction.start()
+
+    def _write_snapshot(self, generation):
+        """
+        The background thread: replays the logs before the generation onto the snapshot,
+        writes the new snapshot to a temporary file, renames it and removes the logs.
+
+        :param generation: int, the first log that is not compacted.
+        """
+        ratings = {}
+        if os.path.exists(self.file_name):
+            replay(self.file_name, ratings)
+        old_generations = [number for number in self._generations() if number < generation]
+        for number in old_generations:
+            replay(self._log_name(number), ratings)
+
+        temporary_name = self.file_name + ".tmp"
+        with open(temporary_name, "w") as file:
+            file.writelines(rating_line(name, score) for name, score in ratings.items())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_name, self.file_name)
+        for number in old_generations:
+            os.remove(self._log_name(number))
+
+    def close(self):
+        """
+        Syncs and closes the log and waits for the compaction to finish.
+        """
+        self.sync()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if self._compaction is not None:
+            self._compaction.join()
@@ -2,46 +2,68 @@
 
 import random
 
+from leaderboard import Leaderboard
+from rating_log import RatingLog
 
-def read_ratings(file_name):
-    """
-    Reads the ratings from a file and returns them as a dictionary.
+TOP_PLAYERS = 10
+POINTS = {"draw": 50, "win": 100, "lose": 0}
 
-    :param file_name: str, file name
-    :return: dict (usernames for keys, ratings for values)
-    """
-    ratings = {}
-    try:
-        with open(file_name, "r") as file:
-            for line in file:
-                name, score = line.split()
-                ratings[name] = int(score)
-    except FileNotFoundError:
-        pass
-    return ratings
-
-
-def write_ratings(file_name, ratings):
+
+def display_leaderboard(leaderboard, k=TOP_PLAYERS):
     """
-    Writes the ratings to a file.
+    Displays the best players with their ranks.
 
-    :param file_name: str, file name
-    :param ratings: dict, (usernames for keys, ratings for values)
+    :param leaderboard: Leaderboard
+    :param k: int, how many players to display.
     """
-    with open(file_name, "w") as file:
-        for name, score in ratings.items():
-            file.write(f"{name} {score}\n")
+    print(f"Top {k} of {len(leaderboard)} players:")
+    for name, score in leaderboard.top(k):
+        print(f"{leaderboard.rank(name)}. {name}: {score}")
 
 
-def display_ratings(ratings):
+class Options(tuple):
     """
-    Displays the ratings of all players.
+    An option set compiled for fast rounds: a tuple of the options with a map from every option
+    to its position, so a round is an O(1) lookup with no new lists.
 
-    :param ratings: dict, (usernames for keys, ratings for values)
+    Every option beats the half of the options before it (cyclically) and loses to the half after it:
+    if the computer's option is d positions after the user's one, the user loses when 1 <= d <= half.
     """
-    print("Current ratings:")
-    for name, score in ratings.items():
-        print(f"{name}: {score}")
+    def __new__(cls, options):
+        """
+        :param options: list of all possible game options.
+        """
+        self = super().__new__(cls, options)
+        self.positions = {option: i for i, option in enumerate(self)}
+        self.half = (len(self) - 1) // 2
+        return self
+
+    def __contains__(self, option):
+        """
+        :param option: str, an option.
+        :return: bool, True if it's one of the options, in O(1).
+        """
+        return option in self.positions
+
+    def index(self, option, *args):
+        """
+        :param option: str, an option.
+        :return: int, the position of the option, in O(1) without a start or end.
+        """
+        if args:
+            return super().index(option, *args)
+        return self.positions[option]
+
+    def outcome(self, user_choice, computer_choice):
+        """
+        :param user_choice: str, the user's choice
+        :param computer_choice: str, the computer's choice
+        :return: str, the result for the user: "draw", "lose" or "win".
+        """
+        distance = (self.positions[computer_choice] - self.positions[user_choice]) % len(self)
+        if distance == 0:
+            return "draw"
+        return "lose" if distance <= self.half else "win"
 
 
 def determine_winner(user_choice, computer_choice, options):
@@ -50,62 +72,72 @@ def determine_winner(user_choice, computer_choice, options):
 
     :param user_choice: str, the user's choice
     :param computer_choice: str, the computer's choice
-    :param options: list,
+    :param options: list, or Options to skip compiling them every round.
     :return: str, the result.
     """
     if user_choice == computer_choice:
         return "draw"
+    if not isinstance(options, Options):
+        options = Options(options)
+    return options.outcome(user_choice, computer_choice)
 
-    index = options.index(user_choice)
-    new_order = options[index + 1:] + options[:index]
-    half = len(new_order) // 2
 
-    if computer_choice in new_order[:half]:
-        return "lose"
-    else:
-        return "win"
+def determine_winners(pairs, options):
+    """
+    Determines the winners of many game rounds with the same options.
+
+    :param pairs: iterable of tuples (user's choice, computer's choice).
+    :param options: list of all possible game options.
+    :return: list of str, the results.
+    """
+    if not isinstance(options, Options):
+        options = Options(options)
+    outcome = options.outcome
+    return [outcome(user_choice, computer_choice) for user_choice, computer_choice in pairs]
 
 
-def play_game(user_choice, user_score, options):
+def play_game(user_choice, user_score, options, say=print):
     """
     Plays a round of the game, updates the user's score based on the result, and prints the result.
 
     :param user_choice: str, the user's choice
     :param user_score: int, the user's current score.
     :param options: list of all possible game options.
+    :param say: function that shows a message to the user, print by default.
     :return: tuple, the updated user score and the result of the game round.
     """
     computer_choice = random.choice(options)
 
     if user_choice not in options:
-        print("Invalid input")
+        say("Invalid input")
         return user_score, None
 
     result = determine_winner(user_choice, computer_choice, options)
     if result == "draw":
-        print(f"There is a draw ({computer_choice})")
-        user_score += 50
+        say(f"There is a draw ({computer_choice})")
     elif result == "win":
-        print(f"Well done. The computer chose {computer_choice} and failed")
-        user_score += 100
+        say(f"Well done. The computer chose {computer_choice} and failed")
     else:
-        print(f"Sorry, but the computer chose {computer_choice}")
+        say(f"Sorry, but the computer chose {computer_choice}")
 
-    return user_score, result
+    return user_score + POINTS[result], result
 
 
 def main():
     """
-    Main function of the game.
+    Main function of the game. Every round appends the new rating to the rating log,
+    the ratings file is rewritten only when the log is compacted.
     """
-    ratings = read_ratings("rating.txt")
+    rating_log = RatingLog("rating.txt")
+    ratings = rating_log.load()
+    leaderboard = Leaderboard(ratings)
 
     user_name = input("Enter your name: ").strip()
     print(f"Hello, {user_name}")
 
     user_score = ratings.get(user_name, 0)
 
-    display_ratings(ratings)
+    display_leaderboard(leaderboard)
 
     options_input = input("Enter options (comma separated) or leave empty for default: ").strip().lower()
     if options_input == "":
@@ -121,22 +153,29 @@ def main():
         else:
             options = [option.strip() for option in options_input.split(',')]
 
+    options = Options(options)
     print("Okay, let's start")
 
     while True:
         user_input = input("Enter an option, !rating or !exit: ").strip().lower()
         if user_input == "!exit":
             print("Bye!")
-            ratings[user_name] = user_score
-            write_ratings("rating.txt", ratings)
+            rating_log.close()
             break
         elif user_input == "!rating":
             print(f"Your rating: {user_score}")
+            if user_name in leaderboard.scores:
+                if len(leaderboard) == 1:
+                    print("Your rank: 1, nobody else is rated yet")
+                else:
+                    print(f"Your rank: {leaderboard.rank(user_name)} of {len(leaderboard)}, "
+                          f"better than {leaderboard.percentile(user_name):.1f}% of the players")
         else:
             user_score, result = play_game(user_input, user_score, options)
             if result is not None:
                 ratings[user_name] = user_score
-                write_ratings("rating.txt", ratings)
+                rating_log.record(user_name, user_score)
+                leaderboard.update(user_name, user_score)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,293 @@
+"""Rock paper scissors server"""
+
+import asyncio
+import sys
+import threading
+
+from rating_log import RATINGS_FILE, RatingLog
+from rock_paper_scissors import POINTS, Options, determine_winner, play_game
+
+HOST = "127.0.0.1"
+PORT = 8889
+FLUSH_SECONDS = 1.0
+BACKLOG = 4096
+DEFAULT_OPTIONS = ["rock", "paper", "scissors"]
+
+
+class RatingStore:
+    """
+    The only copy of the ratings the server changes. Changed ratings are collected
+    and written to the rating log in one batch about once a second, in a thread, so the event loop
+    never waits for the disk. The log is compacted into the ratings file by writing a temporary file
+    and renaming it, so the file is never half written.
+    """
+    def __init__(self, rating_log):
+        """
+        :param rating_log: RatingLog, where the ratings are kept.
+        """
+        self.rating_log = rating_log
+        self.ratings = rating_log.load()
+        self._changed = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """
+        :param name: str, the username.
+        :return: int, the rating, 0 for a new player.
+        """
+        return self.ratings.get(name, 0)
+
+    def set(self, name, score):
+        """
+        :param name: str, the username.
+        :param score: int, the new rating.
+        """
+        self.ratings[name] = score
+        self._changed[name] = score
+
+    def _write(self, changes):
+        """
+        Writes a batch of changes to the log and syncs it, runs in a thread.
+
+        :param changes: list of tuples (name, rating).
+        """
+        with self._lock:
+            for name, score in changes:
+                self.rating_log.record(name, score)
+            self.rating_log.sync()
+
+    async def flush(self):
+        """
+        Writes the ratings changed since the last flush.
+        """
+        if self._changed:
+            changes = list(self._changed.items())
+            self._changed = {}
+            await asyncio.to_thread(self._write, changes)
+
+    def close(self):
+        """
+        Writes the last changes and closes the rating log.
+        """
+        self._write(list(self._changed.items()))
+        self._changed = {}
+        with self._lock:
+            self.rating_log.close()
+
+    async def write_ratings(self):
+        """
+        The writer task: flushes the changes about once a second.
+        """
+        while True:
+            await asyncio.sleep(FLUSH_SECONDS)
+            await self.flush()
+
+
+class Match:
+    """
+    A match of two players: every round waits until both of them have chosen.
+    """
+    def __init__(self, names):
+        """
+        :param names: list of two usernames.
+        """
+        self.names = names
+        self.left = False
+        self._new_round()
+
+    def _new_round(self):
+        """
+        Starts a round: no choices yet and a future for both of them.
+        """
+        self._choices = [None, None]
+        self._done = asyncio.get_running_loop().create_future()
+
+    async def choose(self, player, choice):
+        """
+        :param player: int, 0 or 1, the player who chooses.
+        :param choice: str, the option.
+        :return: str, the opponent's option.
+        :raises ConnectionError: if the opponent has left.
+        """
+        if self.left:
+            raise ConnectionError("The opponent has left.")
+        choices, done = self._choices, self._done
+        choices[player] = choice
+        if None not in choices:
+            done.set_result(choices)
+            self._new_round()
+        return (await done)[1 - player]
+
+    def leave(self):
+        """
+        Ends the match for the opponent of the player who left.
+        """
+        self.left = True
+        if self._choices != [None, None] and not self._done.done():
+            self._done.set_exception(ConnectionError("The opponent has left."))
+
+
+class GameServer:
+    """
+    Hosts rock paper scissors over plain TCP, one line per message, with every session as an asyncio task.
+    A player plays against the computer with play_game or against the next player who is waiting,
+    both sides of a round are judged with determine_winner.
+    """
+    def __init__(self, store):
+        """
+        :param store: RatingStore
+        """
+        self.store = store
+        self.players = set()
+        self._waiting = None
+
+    async def find_opponent(self, name, reader):
+        """
+        Pairs the player with the one who is waiting, or waits for the next one.
+        While waiting, the player's connection is watched, so a player who leaves stops waiting
+        and is never paired. Lines sent while waiting are ignored.
+
+        :param name: str, the username.
+        :param reader: asyncio.StreamReader of the player.
+        :return: tuple: Match, the index of the player in it.
+        :raises ConnectionError: if the player leaves while waiting.
+        """
+        if self._waiting is None or self._waiting[1].done():
+            future = asyncio.get_running_loop().create_future()
+            self._waiting = (name, future)
+            line_task = None
+            try:
+                while not future.done():
+                    line_task = asyncio.ensure_future(reader.readline())
+                    await asyncio.wait([future, line_task], return_when=asyncio.FIRST_COMPLETED)
+                    if line_task.done() and not line_task.result():
+                        if future.done():
+                            future.result().leave()
+                        raise ConnectionError("The client has left.")
+                return future.result(), 1
+            finally:
+                if line_task is not None:
+                    # The reader serves one read at a time: wait until the watching read is really cancelled.
+                    line_task.cancel()
+                    await asyncio.gather(line_task, return_exceptions=True)
+                if self._waiting is not None and self._waiting[1] is future:
+                    self._waiting = None
+        opponent, future = self._waiting
+        self._waiting = None
+        match = Match([name, opponent])
+        future.set_result(match)
+        return match, 0
+
+    async def handle_session(self, reader, writer):
+        """
+        One player: asks the name, the options and the opponent, then plays rounds until !exit.
+
+        :param reader: asyncio.StreamReader
+        :param writer: asyncio.StreamWriter
+        """
+        def say(message):
+            writer.write(f"{message}\n".encode())
+
+        async def ask(prompt):
+            writer.write(prompt.encode())
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("The client has left.")
+            return line.decode(errors="replace").strip()
+
+        name = None
+        match = None
+        try:
+            while True:
+                name = await ask("Enter your name: ")
+                if len(name.split()) != 1:
+                    say("The name should be one word.")
+                elif name in self.players:
+                    say("This name is playing already.")
+                else:
+                    break
+            self.players.add(name)
+            say(f"Hello, {name}")
+
+            while True:
+                opponent = await ask("Play against the computer or a player? Enter computer or player: ")
+                if opponent in ["computer", "player"]:
+                    break
+            if opponent == "player":
+                options = Options(DEFAULT_OPTIONS)
+                say("Waiting for an opponent...")
+                await writer.drain()
+                match, player = await self.find_opponent(name, reader)
+                say(f"You play against {match.names[1 - player]}")
+            else:
+                while True:
+                    options_input = await ask("Enter options (comma separated) or leave empty for default: ")
+                    options = DEFAULT_OPTIONS
+                    if options_input:
+                        options = [option.strip() for option in options_input.lower().split(",")]
+                    if len(options) % 2 == 1 and len(set(options)) == len(options):
+                        options = Options(options)
+                        break
+                    say("Please enter an odd number of different options.")
+            say("Okay, let's start")
+
+            while True:
+                user_input = (await ask("Enter an option, !rating or !exit: ")).lower()
+                if user_input == "!exit":
+                    say("Bye!")
+                    break
+                elif user_input == "!rating":
+                    say(f"Your rating: {self.store.get(name)}")
+                elif match is None:
+                    user_score, result = play_game(user_input, self.store.get(name), options, say)
+                    if result is not None:
+                        self.store.set(name, user_score)
+                elif user_input not in options:
+                    say("Invalid input")
+                else:
+                    try:
+                        opponent_choice = await match.choose(player, user_input)
+                    except ConnectionError:
+                        say("Your opponent has left. Bye!")
+                        match = None
+                        break
+                    result = determine_winner(user_input, opponent_choice, options)
+                    self.store.set(name, self.store.get(name) + POINTS[result])
+                    say(f"{match.names[1 - player]} chose {opponent_choice}: {result}")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if match is not None:
+                match.leave()
+            self.players.discard(name)
+            writer.close()
+
+
+async def serve(host=HOST, port=PORT, file_name=RATINGS_FILE):
+    """
+    Runs the server until it's interrupted.
+
+    :param host: str, the address to listen on.
+    :param port: int, the port to listen on.
+    :param file_name: str, the ratings file.
+    """
+    store = RatingStore(RatingLog(file_name))
+    game = GameServer(store)
+    writer_task = asyncio.create_task(store.write_ratings())
+    server = await asyncio.start_server(game.handle_session, host, port, backlog=BACKLOG)
+    print(f"Serving rock paper scissors on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        writer_task.cancel()
+        store.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT))
+    except KeyboardInterrupt:
+        print("Bye!")
@@ -0,0 +1,238 @@
+"""Monte Carlo simulator of rock paper scissors strategies"""
+
+import itertools
+import operator
+import random
+import sys
+import time
+from collections import Counter
+
+from rock_paper_scissors import POINTS, Options
+
+DEFAULT_OPTIONS = ["rock", "paper", "scissors"]
+ROUNDS = 1000000
+BATCH_SIZE = 10000
+DRAWS = 1024
+
+
+def beaters(option, options):
+    """
+    :param option: int, the position of an option.
+    :param options: Options
+    :return: list of int, the positions of the options that beat it.
+    """
+    return [(option + distance) % len(options) for distance in range(1, options.half + 1)]
+
+
+class UniformStrategy:
+    """
+    Chooses every option with the same chance, like the computer in play_game. Nobody can exploit it.
+    """
+    uses_context = False
+
+    def __init__(self, options):
+        """
+        :param options: Options
+        """
+        self.options = options
+
+    def policy(self):
+        """
+        :return: dict: the opponent's last move (None if it doesn't matter) -> the weights of the options.
+        """
+        return {None: [1] * len(self.options)}
+
+    def learn(self, last_move, moves):
+        """
+        Learns from the opponent's moves in a batch.
+
+        :param last_move: int, the opponent's move before the batch (None in the first batch).
+        :param moves: list of int, the opponent's moves in the batch.
+        """
+
+
+class FrequencyStrategy(UniformStrategy):
+    """
+    Counts the opponent's moves and plays the options that beat the most frequent one.
+    """
+    def __init__(self, options):
+        """
+        :param options: Options
+        """
+        super().__init__(options)
+        self.counts = Counter()
+
+    def policy(self):
+        """
+        :return: dict: None -> the weights of the options that beat the opponent's favourite.
+        """
+        if not self.counts:
+            return super().policy()
+        weights = [0] * len(self.options)
+        for option in beaters(self.counts.most_common(1)[0][0], self.options):
+            weights[option] = 1
+        return {None: weights}
+
+    def learn(self, last_move, moves):
+        """
+        Counts the opponent's moves in a batch.
+        """
+        self.counts.update(moves)
+
+
+class MarkovStrategy(UniformStrategy):
+    """
+    Counts which move the opponent makes after each of their moves and plays the options
+    that beat the most likely next move.
+    """
+    uses_context = True
+
+    def __init__(self, options):
+        """
+        :param options: Options
+        """
+        super().__init__(options)
+        self.transitions = {}
+
+    def policy(self):
+        """
+        :return: dict: the opponent's last move -> the weights of the options that beat the likely next one,
+        None -> uniform weights for a last move that wasn't seen yet.
+        """
+        policy = super().policy()
+        for last_move, counts in self.transitions.items():
+            weights = [0] * len(self.options)
+            for option in beaters(counts.most_common(1)[0][0], self.options):
+                weights[option] = 1
+            policy[last_move] = weights
+        return policy
+
+    def learn(self, last_move, moves):
+        """
+        Counts the opponent's moves after each of their moves in a batch.
+        """
+        for before, move in zip([last_move] + moves, moves):
+            if before is not None:
+                self.transitions.setdefault(before, Counter())[move] += 1
+
+
+STRATEGIES = {
+    "uniform": UniformStrategy,
+    "frequency": FrequencyStrategy,
+    "markov": MarkovStrategy,
+}
+
+
+def _draws(weights, rng):
+    """
+    :param weights: list, the weights of the options.
+    :param rng: random.Random
+    :return: endless iterator of moves, drawn DRAWS at a time with random.choices.
+    """
+    population = range(len(weights))
+    while True:
+        yield from rng.choices(population, weights, k=DRAWS)
+
+
+def play_batch(first, second, rounds, last_moves, points, rng):
+    """
+    Plays a batch of rounds while both strategies keep the policies they had at the start of the batch.
+    Without a strategy that looks at the last move all moves are drawn with random.choices(k=rounds)
+    and scored with map over the points table; otherwise the moves come from pools drawn per last move.
+
+    :param first: the first strategy.
+    :param second: the second strategy.
+    :param rounds: int, the number of rounds.
+    :param last_moves: list: the last moves of the first and the second strategy (None at first).
+    :param points: list, the points of the first strategy for the move pair first * n + second.
+    :param rng: random.Random
+    :return: tuple: the points of the first strategy, the moves of the first, the moves of the second.
+    """
+    size = len(first.options)
+    first_policy, second_policy = first.policy(), second.policy()
+    if not first.uses_context and not second.uses_context:
+        first_moves = rng.choices(range(size), first_policy[None], k=rounds)
+        second_moves = rng.choices(range(size), second_policy[None], k=rounds)
+        pairs = map(operator.add, map(operator.mul, first_moves, itertools.repeat(size)), second_moves)
+        return sum(map(points.__getitem__, pairs)), first_moves, second_moves
+
+    first_pools, second_pools = {}, {}
+    first_last, second_last = last_moves
+    first_moves, second_moves = [], []
+    score = 0
+    for _ in range(rounds):
+        context = second_last if first.uses_context and second_last in first_policy else None
+        if context not in first_pools:
+            first_pools[context] = _draws(first_policy[context], rng)
+        first_move = next(first_pools[context])
+
+        context = first_last if second.uses_context and first_last in second_policy else None
+        if context not in second_pools:
+            second_pools[context] = _draws(second_policy[context], rng)
+        second_move = next(second_pools[context])
+
+        score += points[first_move * size + second_move]
+        first_moves.append(first_move)
+        second_moves.append(second_move)
+        first_last, second_last = first_move, second_move
+    return score, first_moves, second_moves
+
+
+def simulate(first_name, second_name, options=DEFAULT_OPTIONS, rounds=ROUNDS, batch_size=BATCH_SIZE, seed=0):
+    """
+    Plays two strategies against each other in batches, they learn from each other after every batch.
+    A round is scored like in play_game: 100 points for a win, 50 for a draw, 0 for a loss.
+
+    :param first_name: str, a key of STRATEGIES.
+    :param second_name: str, a key of STRATEGIES.
+    :param options: list of all possible game options, an odd number of them.
+    :param rounds: int, the number of rounds.
+    :param batch_size: int, the number of rounds between the updates of the strategies.
+    :param seed: int, the seed of the random moves.
+    :return: tuple: the expected points per round of the first and the second strategy.
+    """
+    options = Options(options)
+    if len(options) % 2 != 1:
+        raise ValueError("The number of options should be odd.")
+    points = [POINTS[options.outcome(first, second)] for first in options for second in options]
+    first = STRATEGIES[first_name](options)
+    second = STRATEGIES[second_name](options)
+    rng = random.Random(seed)
+
+    score = 0
+    last_moves = [None, None]
+    for start in range(0, rounds, batch_size):
+        batch_score, first_moves, second_moves = play_batch(
+            first, second, min(batch_size, rounds - start), last_moves, points, rng)
+        score += batch_score
+        first.learn(last_moves[1], second_moves)
+        second.learn(last_moves[0], first_moves)
+        last_moves = [first_moves[-1], second_moves[-1]]
+    return score / rounds, POINTS["win"] - score / rounds
+
+
+def main():
+    """Plays every pair of strategies from the command line:
+    python simulator.py [rounds] [options (comma separated)]"""
+    if len(sys.argv) > 3 or (len(sys.argv) > 1 and not sys.argv[1].isdigit()):
+        print("Usage: python simulator.py [rounds] [options (comma separated)]")
+        return
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else ROUNDS
+    options = [option.strip() for option in sys.argv[2].split(",")] if len(sys.argv) > 2 else DEFAULT_OPTIONS
+
+    totals = Counter()
+    for first_name, second_name in itertools.combinations_with_replacement(STRATEGIES, 2):
+        start = time.perf_counter()
+        first_score, second_score = simulate(first_name, second_name, options, rounds)
+        seconds = time.perf_counter() - start
+        print(f"{first_name} vs {second_name}: {first_score:.2f} - {second_score:.2f} points per round, "
+              f"{rounds / seconds:,.0f} rounds per second")
+        totals[first_name] += first_score
+        totals[second_name] += second_score
+    print("Expected points per round against all strategies:")
+    for name in STRATEGIES:
+        print(f"{name}: {totals[name] / (len(STRATEGIES) + 1):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Perfect-play opening book for Tictactoe"""
+
+import mmap
+import os
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+# Every board is encoded as a base-3 number of its 9 cells (" " = 0, "X" = 1, "O" = 2),
+# so the table has exactly 3 ** 9 one-byte entries indexed by that code.
+TABLE_SIZE = 3 ** 9
+CELL_CODES = {" ": 0, "X": 1, "O": 2}
+
+# Layout of a single table entry.
+NO_ENTRY = 0xFF
+NO_MOVE = 0x0F
+VALUES = ["X wins", "Draw", "O wins"]
+
+# The 8 symmetries of the square, as permutations of cell indices:
+# the transformed board's cell i is the original board's cell SYMMETRIES[t][i].
+_ROTATE = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+_MIRROR = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+
+
+def _compose(first, second):
+    """
+    Composes two cell permutations.
+
+    :param first: tuple, permutation applied first.
+    :param second: tuple, permutation applied second.
+    :return: tuple, the resulting permutation.
+    """
+    return tuple(first[second[i]] for i in range(9))
+
+
+def _all_symmetries():
+    """
+    Builds the 8 symmetries of the board out of rotations and a mirror.
+
+    :return: list of tuples (cell permutations).
+    """
+    symmetries = []
+    permutation = tuple(range(9))
+    for _ in range(4):
+        symmetries.append(permutation)
+        symmetries.append(_compose(permutation, _MIRROR))
+        permutation = _compose(permutation, _ROTATE)
+    return symmetries
+
+
+SYMMETRIES = _all_symmetries()
+
+
+def encode(cells):
+    """
+    Encodes a flat board (9 symbols) as a base-3 number.
+
+    :param cells: sequence of 9 str (" ", "X" or "O").
+    :return: int from 0 to 3 ** 9 - 1.
+    """
+    code = 0
+    for cell in cells:
+        code = code * 3 + CELL_CODES[cell]
+    return code
+
+
+def canonicalize(cells):
+    """
+    Finds the smallest code among all 8 symmetric versions of the board.
+
+    :param cells: sequence of 9 str (" ", "X" or "O").
+    :return: tuple: int (canonical code), tuple (symmetry that produced it).
+    """
+    return min((encode([cells[i] for i in symmetry]), symmetry) for symmetry in SYMMETRIES)
+
+
+def _to_board(cells):
+    """
+    Turns a flat board into the list of rows used by the game.
+
+    :param cells: list of 9 str.
+    :return: list of lists.
+    """
+    return [cells[0:3], cells[3:6], cells[6:9]]
+
+
+def _solve(cells, memo, table, analyze_board):
+    """
+    Solves a position with minimax and records it in the table (only canonical positions are stored).
+
+    :param cells: list of 9 str, the position with the side to move derived from the symbol counts.
+    :param memo: dict, canonical code -> score of the position.
+    :param table: bytearray, the opening book being built.
+    :param analyze_board: function, the rules of the game: board -> the result message.
+    :return: int, score of the position: positive if X wins, negative if O wins, 0 for a draw.
+                  Quicker wins have bigger absolute scores.
+    """
+    code, symmetry = canonicalize(cells)
+    if code in memo:
+        return memo[code]
+
+    canonical = [cells[i] for i in symmetry]
+    result = analyze_board(_to_board(canonical))
+    filled = 9 - canonical.count(" ")
+
+    if result == "Congrats, X wins!":
+        score, move = 10 - filled, NO_MOVE
+    elif result == "Congrats, O wins!":
+        score, move = filled - 10, NO_MOVE
+    elif result == "It's a draw!":
+        score, move = 0, NO_MOVE
+    else:
+        player = "X" if canonical.count("X") == canonical.count("O") else "O"
+        score, move = None, NO_MOVE
+        for cell in range(9):
+            if canonical[cell] != " ":
+                continue
+            canonical[cell] = player
+            child_score = _solve(canonical, memo, table, analyze_board)
+            canonical[cell] = " "
+            if score is None or (child_score > score if player == "X" else child_score < score):
+                score, move = child_score, cell
+
+    value = 0 if score > 0 else 2 if score < 0 else 1
+    table[code] = (value << 4) | move
+    memo[code] = score
+    return score
+
+
+def build_book(analyze_board, path=BOOK_PATH):
+    """
+    The build step. Enumerates every legal position reachable from the empty board with the current
+    rules of analyze_board, solves it and writes the table to a binary file.
+
+    Each byte of the file is the entry for the canonical board with that code:
+    bits 0-3 are the best move (cell index 0-8 of the canonical board, 15 for finished games),
+    bits 4-5 are the game value under perfect play (0 - X wins, 1 - draw, 2 - O wins),
+    255 marks codes that are not canonical legal positions.
+    The table is written to a temporary file and renamed, so an interrupted build never leaves half a table.
+
+    :param analyze_board: function, the rules of the game (tictactoe.analyze_board): board -> the result message.
+    :param path: str, where to write the table.
+    :return: int, the number of canonical positions stored.
+    """
+    table = bytearray([NO_ENTRY]) * TABLE_SIZE
+    memo = {}
+    _solve([" "] * 9, memo, table, analyze_board)
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(table)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+    return len(memo)
+
+
+class OpeningBook:
+    """This class gives read-only access to the built table. The file is memory-mapped on the first lookup,
+    so nothing is read until the computer actually has to move."""
+    def __init__(self, analyze_board, path=BOOK_PATH):
+        """Initialization of the book, the table itself is not loaded yet.
+        :arg: analyze_board (function): the rules of the game, used if the table has to be built.
+        :arg: path (str): the table file."""
+        self.analyze_board = analyze_board
+        self.path = path
+        self._table = None
+
+    def _load(self):
+        """Maps the table file into memory, building it first if it doesn't exist yet
+        or isn't a whole table (like a file left by an older, interrupted build).
+        :returns: mmap or bytes with the table."""
+        if self._table is None:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) != TABLE_SIZE:
+                build_book(self.analyze_board, self.path)
+            with open(self.path, "rb") as file:
+                self._table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._table
+
+    def lookup(self, board):
+        """Finds the best move and the game value for a board with a single table lookup.
+        :arg: board (list): list of rows, as used by the game.
+        :returns: tuple: (row, column) from 1 to 3 or None if the game is finished, str game value."""
+        cells = [cell for row in board for cell in row]
+        code, symmetry = canonicalize(cells)
+        entry = self._load()[code]
+        if entry == NO_ENTRY:
+            raise ValueError("This position can't be reached in a legal game.")
+
+        value = VALUES[entry >> 4]
+        move = entry & 0x0F
+        if move == NO_MOVE:
+            return None, value
+        cell = symmetry[move]
+        return (cell // 3 + 1, cell % 3 + 1), value
+
+    def best_move(self, board):
+        """Answers a move of the current player.
+        :arg: board (list): list of rows, as used by the game.
+        :returns: tuple with coordinates (row and column) from 1 to 3."""
+        move, _ = self.lookup(board)
+        if move is None:
+            raise ValueError("The game is already finished.")
+        return move
+
+
+if __name__ == "__main__":
+    from tictactoe import analyze_board
+
+    positions = build_book(analyze_board)
+    print(f"Stored {positions} canonical positions in {BOOK_PATH}")
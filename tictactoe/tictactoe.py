@@ -1,5 +1,7 @@
 """Project Tictactoe"""
 
+import opening_book
+
 
 def print_board(board):
     """
@@ -88,45 +90,61 @@ def analyze_board(board):
         return "Game not finished"
 
 
-board = [
-    [" ", " ", " "],
-    [" ", " ", " "],
-    [" ", " ", " "]
-]
-
+def main(computer_plays_o=False):
+    """
+    The main cycle of the game. X always goes first. When computer_plays_o is True,
+    O's moves are taken from the precomputed opening book instead of the user's input.
 
-while True:
-    # Not a function, but the main cycle of the game. Prints the board.
-    print_board(board)
+    :param computer_plays_o: bool, whether the computer plays for O.
+    :return: None.
+    """
+    book = opening_book.OpeningBook(analyze_board) if computer_plays_o else None
+    board = [
+        [" ", " ", " "],
+        [" ", " ", " "],
+        [" ", " ", " "]
+    ]
 
     while True:
-        """Cycle that uses function to get the coordinates from the user, user another one to check them, then places
-        X in the right place and breaks."""
-        coordinates = get_user_coordinates()
-        if is_valid_coordinates(coordinates, board):
-            x, y = coordinates
-            board[x - 1][y - 1] = "X"
+        print_board(board)
+
+        while True:
+            """Cycle that uses function to get the coordinates from the user, user another one to check them, then
+            places X in the right place and breaks."""
+            coordinates = get_user_coordinates()
+            if is_valid_coordinates(coordinates, board):
+                x, y = coordinates
+                board[x - 1][y - 1] = "X"
+                break
+
+        result = analyze_board(board)
+        if result != "Game not finished":
+            print_board(board)
+            print(result)
             break
 
-    result = analyze_board(board)
-    if result != "Game not finished":
         print_board(board)
-        print(result)
-        break
-
-    print_board(board)
 
-    while True:
-        """The same for O."""
-        coordinates = get_user_coordinates()
-        if is_valid_coordinates(coordinates, board):
-            x, y = coordinates
+        if computer_plays_o:
+            x, y = book.best_move(board)
+            print(f"Computer plays {x} {y}")
             board[x - 1][y - 1] = "O"
+        else:
+            while True:
+                """The same for O."""
+                coordinates = get_user_coordinates()
+                if is_valid_coordinates(coordinates, board):
+                    x, y = coordinates
+                    board[x - 1][y - 1] = "O"
+                    break
+
+        result = analyze_board(board)
+        if result != "Game not finished":
+            print_board(board)
+            print(result)
             break
 
-    result = analyze_board(board)
-    if result != "Game not finished":
-        print_board(board)
-        print(result)
-        break
 
+if __name__ == "__main__":
+    answer = input("Do you want to play against the computer? Enter yes or no.> ").strip().lower()
+    main(computer_plays_o=answer in ["yes", "y"])